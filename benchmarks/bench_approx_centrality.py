@@ -0,0 +1,73 @@
+# Reports the error and speed-up of the sampled closeness and betweenness of
+# CentralityAnalysis against the exact networkx values, on PR participation
+# graphs of synthetic communities. Run from the repository root:
+#
+#   python benchmarks/bench_approx_centrality.py -a 1000 3000 -k 100 250 500
+import argparse
+import os
+import sys
+import time
+
+import networkx as nx
+import numpy as np
+from scipy import stats
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from csdetector.metrics.centralityAnalysis import CentralityAnalysis, approximateCloseness
+
+
+def errors(exact: dict, approximate: dict) -> str:
+    nodes = list(exact)
+    expected = np.array([exact[node] for node in nodes])
+    estimated = np.array([approximate[node] for node in nodes])
+
+    # the models read the mean and spread of each centrality per batch
+    meanError = abs(estimated.mean() - expected.mean()) / expected.mean() * 100 if expected.mean() > 0 else 0.0
+    rank = stats.spearmanr(expected, estimated).correlation if len(nodes) > 1 else 1.0
+
+    return "max {:8.5f}  mean {:8.5f}  mean of values {:6.2f}%  rank corr {:6.4f}".format(
+        np.abs(estimated - expected).max(), np.abs(estimated - expected).mean(), meanError, rank
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Approximate centrality benchmark")
+    parser.add_argument("-a", "--authors", type=int, nargs="+", default=[1000, 3000])
+    parser.add_argument("-k", "--samples", type=int, nargs="+", default=[100, 250, 500])
+    parser.add_argument("-p", "--itemsPerAuthor", type=int, default=3, help="PRs per developer in the community")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    for authorCount in args.authors:
+        # uniform participation, zipf leaves most developers out of the graph
+        random = np.random.default_rng(args.seed)
+        batch = [
+            ["author{}".format(author) for author in random.integers(0, authorCount, size).tolist()]
+            for size in random.integers(1, 6, authorCount * args.itemsPerAuthor).tolist()
+        ]
+        G, _ = CentralityAnalysis.participationGraph(batch)
+        print("{} developers, {} edges".format(G.number_of_nodes(), G.number_of_edges()))
+
+        start = time.perf_counter()
+        exactCloseness = nx.closeness_centrality(G)
+        closenessTime = time.perf_counter() - start
+
+        start = time.perf_counter()
+        exactBetweenness = nx.betweenness_centrality(G)
+        betweennessTime = time.perf_counter() - start
+
+        print("  exact        closeness {:7.2f} s  betweenness {:7.2f} s".format(closenessTime, betweennessTime))
+
+        for samples in args.samples:
+            start = time.perf_counter()
+            closeness = approximateCloseness(G, samples, args.seed)
+            closenessTime = time.perf_counter() - start
+
+            start = time.perf_counter()
+            betweenness = nx.betweenness_centrality(G, k=min(samples, G.number_of_nodes()), seed=args.seed)
+            betweennessTime = time.perf_counter() - start
+
+            print("  k={:<5}      closeness {:7.2f} s  betweenness {:7.2f} s".format(samples, closenessTime, betweennessTime))
+            print("    closeness   " + errors(exactCloseness, closeness))
+            print("    betweenness " + errors(exactBetweenness, betweenness))
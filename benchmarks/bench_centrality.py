@@ -0,0 +1,155 @@
+# Times the graph builders of CentralityAnalysis on synthetic data and checks
+# them against the pairwise scans they replaced on the smaller inputs: the
+# sliding window co-commit graph and the sparse PR/issue participation graph.
+# Run from the repository root:
+#
+#   python benchmarks/bench_centrality.py -n 1000 10000 100000 1000000 -i 1000 10000 50000 -a 500
+import argparse
+import os
+import sys
+import time
+from collections import Counter
+from datetime import datetime
+
+import numpy as np
+from dateutil.relativedelta import relativedelta
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from csdetector.entities.CommitTable import CommitTable
+from csdetector.metrics.centralityAnalysis import CentralityAnalysis
+
+# two years of history starting on a month end, so day clamping is exercised
+START = int(datetime(2019, 1, 31).timestamp())
+SPAN = 2 * 365 * 24 * 3600
+
+
+def syntheticCommits(count: int, authorCount: int, seed: int) -> CommitTable:
+    random = np.random.default_rng(seed)
+    timestamps = np.sort(START + random.integers(0, SPAN, count)).astype(np.int64)
+
+    # a few authors make most of the commits, as in real projects
+    authorIds = np.minimum(random.zipf(1.5, count) - 1, authorCount - 1).astype(np.int32)
+
+    return CommitTable(
+        np.array([b"%040x" % idx for idx in range(count)], dtype="S40"),
+        ["author{}".format(idx) for idx in range(authorCount)],
+        authorIds,
+        timestamps,
+        np.zeros(count, dtype=np.int32),
+        timestamps,
+        np.zeros(count, dtype=np.int32),
+        "",
+        np.zeros(count + 1, dtype=np.int64),
+    )
+
+
+# participant lists of PRs or issues, 1 to 10 participants each, duplicates kept
+def syntheticItems(count: int, authorCount: int, seed: int) -> list:
+    random = np.random.default_rng(seed)
+    sizes = random.integers(1, 11, count)
+    authorIds = np.minimum(random.zipf(1.5, int(sizes.sum())) - 1, authorCount - 1)
+    names = ["author{}".format(idx) for idx in authorIds.tolist()]
+    offsets = np.concatenate([[0], np.cumsum(sizes)]).tolist()
+    return [names[offsets[idx] : offsets[idx + 1]] for idx in range(count)]
+
+
+# the scan formerly done by CentralityAnalysis.buildGraph
+def pairwiseParticipationGraph(batch: list):
+    allRelatedAuthors = {}
+    authorItems = Counter({})
+
+    for authors in batch:
+        for author in authors:
+            authorItems.update({author: 1})
+
+            relatedAuthors = set(
+                relatedAuthor
+                for otherAuthors in batch
+                for relatedAuthor in otherAuthors
+                if author in otherAuthors and relatedAuthor != author
+            )
+            allRelatedAuthors.setdefault(author, set()).update(relatedAuthors)
+
+    return CentralityAnalysis._relatedAuthorsGraph(allRelatedAuthors), authorItems
+
+
+def sameGraph(first, second) -> bool:
+    return set(first.nodes) == set(second.nodes) and set(map(frozenset, first.edges)) == set(map(frozenset, second.edges))
+
+
+# the pairwise scan formerly done by CentralityAnalysis._processBatch
+def pairwiseRelatedAuthors(commits: CommitTable):
+    allRelatedAuthors = {}
+    authorCommits = Counter({})
+
+    authors = [commits.author(i) for i in range(len(commits))]
+    commitDates = [datetime.fromtimestamp(timestamp) for timestamp in commits.committedTs.tolist()]
+
+    for author, commitDate in zip(authors, commitDates):
+        authorCommits.update({author: 1})
+
+        earliestDate = commitDate + relativedelta(months=-1)
+        latestDate = commitDate + relativedelta(months=+1)
+
+        commitRelatedAuthors = set(
+            otherAuthor
+            for otherAuthor, otherDate in zip(authors, commitDates)
+            if author != otherAuthor and earliestDate <= otherDate <= latestDate
+        )
+
+        allRelatedAuthors.setdefault(author, set()).update(commitRelatedAuthors)
+
+    return allRelatedAuthors, authorCommits
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Centrality graph builder benchmark")
+    parser.add_argument("-n", "--commits", type=int, nargs="+", default=[1000, 10000, 100000, 1000000])
+    parser.add_argument("-i", "--items", type=int, nargs="+", default=[1000, 10000, 50000])
+    parser.add_argument("-a", "--authors", type=int, default=500)
+    parser.add_argument("-c", "--checkLimit", type=int, default=5000, help="Largest history checked against the pairwise scan")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    print("{:>10} {:>8} {:>10} {:>10} {:>10}  {}".format("items", "authors", "edges", "sparse s", "pairwise s", "same graph"))
+
+    for count in args.items:
+        batch = syntheticItems(count, args.authors, args.seed)
+
+        start = time.perf_counter()
+        G, authorItems = CentralityAnalysis.participationGraph(batch)
+        elapsed = time.perf_counter() - start
+
+        pairwise = "-"
+        same = "-"
+
+        if count <= args.checkLimit:
+            start = time.perf_counter()
+            expectedGraph, expectedItems = pairwiseParticipationGraph(batch)
+            pairwise = "{:.2f}".format(time.perf_counter() - start)
+            same = str(sameGraph(G, expectedGraph) and authorItems == expectedItems)
+
+        print("{:>10} {:>8} {:>10} {:>10.2f} {:>10}  {}".format(count, len(authorItems), G.number_of_edges(), elapsed, pairwise, same))
+
+    print()
+    print("{:>10} {:>8} {:>10} {:>10} {:>10}  {}".format("commits", "authors", "edges", "window s", "pairwise s", "same graph"))
+
+    for count in args.commits:
+        commits = syntheticCommits(count, args.authors, args.seed)
+
+        start = time.perf_counter()
+        related, authorCommits = CentralityAnalysis.relatedAuthors(commits)
+        elapsed = time.perf_counter() - start
+
+        edges = sum(len(authors) for authors in related.values()) // 2
+        pairwise = "-"
+        same = "-"
+
+        if count <= args.checkLimit:
+            start = time.perf_counter()
+            expected = pairwiseRelatedAuthors(commits)
+            pairwise = "{:.2f}".format(time.perf_counter() - start)
+            same = str(expected == (related, authorCommits) and list(expected[0]) == list(related))
+
+        print("{:>10} {:>8} {:>10} {:>10.2f} {:>10}  {}".format(count, len(related), edges, elapsed, pairwise, same))
@@ -0,0 +1,69 @@
+# Compares clone time and disk use of the full clone against the metadata
+# (bare, blobless) and shallow clone modes of utils.getRepo, and times the
+# commit table parse on each clone. Run from the repository root:
+#
+#   python benchmarks/bench_clone.py -r https://github.com/torvalds/linux -sd 2020-01-01
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from csdetector import utils
+from csdetector.entities.CommitTable import CommitTable
+
+# clone options and whether the clone is bare
+MODES = {
+    "full": ([], False),
+    "metadata": (["--filter=blob:none"], True),
+    "shallow": (["--shallow-since={startDate}"], False),
+    "metadata+shallow": (["--filter=blob:none", "--shallow-since={startDate}"], True),
+}
+
+
+def diskUsage(path: str) -> int:
+    return sum(
+        os.path.getsize(os.path.join(root, name))
+        for root, dirs, files in os.walk(path)
+        for name in files
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Clone mode benchmark")
+    parser.add_argument("-r", "--repositoryUrl", required=True)
+    parser.add_argument("-sd", "--startDate", help="Start date used by the shallow modes")
+    parser.add_argument("-m", "--modes", nargs="+", choices=list(MODES), default=list(MODES))
+    args = parser.parse_args()
+
+    workspace = tempfile.mkdtemp()
+    results = []
+
+    for mode in args.modes:
+        if args.startDate is None and "shallow" in mode:
+            continue
+
+        options, bare = MODES[mode]
+        options = [option.format(startDate=args.startDate) for option in options]
+        path = os.path.join(workspace, mode)
+
+        start = time.perf_counter()
+        repo = utils.cloneRepo(args.repositoryUrl, path, options, bare)
+        cloneTime = time.perf_counter() - start
+        print()
+
+        start = time.perf_counter()
+        commits = CommitTable.fromRepo(repo)
+        parseTime = time.perf_counter() - start
+
+        results.append((mode, cloneTime, diskUsage(path), len(commits), parseTime))
+        utils.remove_tree(path)
+
+    for mode, cloneTime, size, count, parseTime in results:
+        print(
+            "{:<17} clone {:8.2f} s  {:10.1f} MiB  {:>8} commits  parse {:6.2f} s".format(
+                mode, cloneTime, size / (1 << 20), count, parseTime
+            )
+        )
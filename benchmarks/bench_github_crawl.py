@@ -0,0 +1,91 @@
+# Benchmarks the PR, issue, release and commit listing crawls offline against
+# a GitHubMockServer replaying fixtures recorded with `main.py --record <dir>`.
+#
+#   python benchmarks/bench_github_crawl.py -f fixtures -r https://github.com/owner/repo -l 50 -c 1 10 30
+import argparse
+import logging
+import os
+import sys
+import tempfile
+import threading
+import time
+
+from werkzeug.serving import make_server
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from csdetector import Configuration
+from csdetector.github.GitHubMockServer import GitHubMockServer
+from csdetector.github.GitHubRequestController import GitHubRequestController
+from csdetector.github.GitHubRequestIssues import GitHubRequestIssues
+from csdetector.github.GitHubRequestPullRequest import GitHubRequestPullRequest
+from csdetector.github.GitHubRequestReleases import GitHubRequestReleases
+from csdetector.github.GitHubResquestCommits import GitHubRequestCommits
+
+
+def crawlPages(config: Configuration, strategy) -> int:
+    GitHubRequestController.setStrategy(strategy)
+    pages = GitHubRequestController.numberOfPages(config)
+    responses = [GitHubRequestController.requestPerPage(config, page) for page in range(1, pages + 1)]
+    return sum(len(response.json()) for response in responses if response is not None)
+
+
+def crawlPullRequests(config: Configuration) -> int:
+    GitHubRequestController.setStrategy(GitHubRequestPullRequest)
+    return len(GitHubRequestController.requestPullRequests(config))
+
+
+def crawlIssues(config: Configuration) -> int:
+    GitHubRequestController.setStrategy(GitHubRequestIssues)
+    return len(GitHubRequestController.requestIssues(config))
+
+
+PIPELINES = {
+    "pullRequests": crawlPullRequests,
+    "issues": crawlIssues,
+    "releases": lambda config: crawlPages(config, GitHubRequestReleases),
+    "commits": lambda config: crawlPages(config, GitHubRequestCommits),
+}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Offline GitHub crawl benchmark")
+    parser.add_argument("-f", "--fixtures", required=True)
+    parser.add_argument("-r", "--repositoryUrl", required=True)
+    parser.add_argument("-l", "--latency", type=float, default=50)
+    parser.add_argument("-c", "--concurrency", type=int, nargs="+", default=[1, 10])
+    parser.add_argument("--rateLimitEvery", type=int, default=0)
+    parser.add_argument("--graphql", action="store_true")
+    args = parser.parse_args()
+
+    logging.getLogger("werkzeug").setLevel(logging.WARNING)
+
+    mock = GitHubMockServer(args.fixtures, args.latency, args.rateLimitEvery)
+    server = make_server("127.0.0.1", 0, mock.app, threaded=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    for concurrency in args.concurrency:
+        config = Configuration(
+            args.repositoryUrl, 9999, tempfile.mkdtemp(), "", 0, "token", None, None,
+            requestConcurrency=concurrency,
+            requestPoolSize=concurrency,
+            responseCache=False,
+            graphql=args.graphql,
+            apiUrl="http://127.0.0.1:{}".format(server.server_port),
+        )
+        GitHubRequestController(config)
+
+        for name, crawl in PIPELINES.items():
+            requests = mock.requestCount
+            start = time.perf_counter()
+            items = crawl(config)
+            elapsed = time.perf_counter() - start
+            print(
+                "concurrency {:>3}  {:<13} {:>6} items  {:>6} requests  {:8.2f} s".format(
+                    concurrency, name, items, mock.requestCount - requests, elapsed
+                )
+            )
+
+        GitHubRequestController.close()
+
+    server.shutdown()
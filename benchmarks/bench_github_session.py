@@ -0,0 +1,83 @@
+# Compares the per-request latency of one-off `requests.get` calls against the
+# pooled, keep-alive sessions used by GitHubRequestHelper.
+#
+# A local mock server stands in for api.github.com so the numbers only reflect
+# connection handling. Run from the repository root:
+#
+#   python benchmarks/bench_github_session.py -n 500
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from csdetector import Configuration
+from csdetector.github.GitHubRequestHelper import GitHubRequestHelper
+
+BODY = json.dumps([{"body": "comment", "number": i} for i in range(30)]).encode()
+
+
+class MockHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(BODY)))
+        self.end_headers()
+        self.wfile.write(BODY)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def measure(fn, url: str, count: int):
+    latencies = []
+    for _ in range(count):
+        start = time.perf_counter()
+        response = fn(url)
+        assert response.status_code == 200
+        latencies.append((time.perf_counter() - start) * 1000)
+    return latencies
+
+
+def report(name: str, latencies):
+    latencies = sorted(latencies)
+    print(
+        "{:<10} mean {:7.3f} ms  median {:7.3f} ms  p95 {:7.3f} ms".format(
+            name,
+            statistics.mean(latencies),
+            statistics.median(latencies),
+            latencies[int(len(latencies) * 0.95) - 1],
+        )
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="GitHub request pooling benchmark")
+    parser.add_argument("-n", "--requests", type=int, default=300)
+    args = parser.parse_args()
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), MockHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = "http://127.0.0.1:{}/repos/owner/repo/issues".format(server.server_port)
+
+    config = Configuration(
+        "https://github.com/owner/repo", 9999, tempfile.gettempdir(), "", 0, "token", None, None
+    )
+    GitHubRequestHelper.init_tokens(config)
+
+    report("before", measure(lambda u: requests.get(u, headers={"Authorization": "token token"}), url, args.requests))
+    report("after", measure(GitHubRequestHelper.request, url, args.requests))
+
+    GitHubRequestHelper.close()
+    server.shutdown()
@@ -0,0 +1,86 @@
+# Measures the throughput of the SentiStrength backends in comments per second
+# and, when Java and SentiStrength.jar are available, the agreement of the
+# in-process lexicon scorer with the jar.
+#
+# The corpus is a text file with one comment per line, or the commit messages
+# of a local repository. Run from the repository root:
+#
+#   python benchmarks/bench_sentiment.py -s senti -c comments.txt
+#   python benchmarks/bench_sentiment.py -s senti -r out/owner/repo/owner.repo -w 1 4 -j 1 4
+import argparse
+import os
+import shutil
+import sys
+import time
+from collections import Counter
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from csdetector.entities.CommitTable import CommitTable
+from csdetector.metrics.sentiStrengthLexicon import SentiStrengthLexicon
+from csdetector.metrics.sentiStrengthPool import SentiStrengthPool
+
+
+def readCorpus(args) -> list:
+    if args.corpus is not None:
+        with open(args.corpus, encoding="utf-8", errors="ignore") as f:
+            return [line.rstrip("\n") for line in f if line.strip()]
+
+    from git.repo import Repo
+    return [message for message in CommitTable.fromRepo(Repo(args.repository)).messages() if message.strip()]
+
+
+def timeScorer(name: str, scorer, corpus: list) -> list:
+    start = time.perf_counter()
+    scores = scorer.getSentiment(corpus, score="trinary")
+    elapsed = time.perf_counter() - start
+    scorer.close()
+
+    print("{:<12} {:>8} comments  {:8.2f} s  {:>10.0f} comments/s".format(name, len(corpus), elapsed, len(corpus) / elapsed))
+    return scores
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="SentiStrength backend benchmark")
+    parser.add_argument("-s", "--sentiStrengthPath", required=True)
+    group = parser.add_mutually_exclusive_group(required=True)
+    group.add_argument("-c", "--corpus", help="Text file with one comment per line")
+    group.add_argument("-r", "--repository", help="Local repository whose commit messages are scored")
+    parser.add_argument("-w", "--workers", type=int, nargs="+", default=[4], help="SentiStrength.jar pool sizes")
+    parser.add_argument("-j", "--jobs", type=int, nargs="+", default=[1], help="Python backend worker processes")
+    parser.add_argument("-n", "--mismatches", type=int, default=10, help="Disagreements printed")
+    args = parser.parse_args()
+
+    jarPath = os.path.join(args.sentiStrengthPath, "SentiStrength.jar")
+    dataPath = os.path.join(args.sentiStrengthPath, "SentiStrength_Data") + "/"
+    corpus = readCorpus(args)
+
+    lexiconScores = None
+    for jobs in args.jobs:
+        scores = timeScorer("python x{}".format(jobs), SentiStrengthLexicon(dataPath, jobs=jobs), corpus)
+        if lexiconScores is not None and scores != lexiconScores:
+            print("python x{} scores differ from python x{}".format(jobs, args.jobs[0]))
+        lexiconScores = scores
+
+    if shutil.which("java") is None or not os.path.exists(jarPath):
+        print("Java or SentiStrength.jar not found, skipping the jar backend, agreement not measured")
+        sys.exit(0)
+
+    jarScores = None
+    for workers in args.workers:
+        jarScores = timeScorer("java x{}".format(workers), SentiStrengthPool(jarPath, dataPath, workers), corpus)
+
+    # agreement of the lexicon scorer with the jar
+    scaleAgreement = sum(1 for a, b in zip(lexiconScores, jarScores) if a[0] + a[1] == b[0] + b[1])
+    exactAgreement = sum(1 for a, b in zip(lexiconScores, jarScores) if a[:2] == b[:2])
+    differences = Counter((a[0] + a[1]) - (b[0] + b[1]) for a, b in zip(lexiconScores, jarScores))
+
+    print("scale agreement     {:6.2f}%".format(scaleAgreement / len(corpus) * 100))
+    print("pos/neg agreement   {:6.2f}%".format(exactAgreement / len(corpus) * 100))
+    print("scale differences   {}".format(dict(sorted(differences.items()))))
+
+    printed = 0
+    for text, a, b in zip(corpus, lexiconScores, jarScores):
+        if a[:2] != b[:2] and printed < args.mismatches:
+            print("  python {} java {}  {}".format(a[:2], b[:2], text[:100]))
+            printed += 1
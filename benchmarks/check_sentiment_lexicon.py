@@ -0,0 +1,61 @@
+# Regression check of the rules of the in-process lexicon scorer, without
+# Java. The fixture has its own SentiStrength_Data lists, corpus.tsv holds
+# "positive negative neutral text" per line.
+#
+# The committed scores were derived by hand from the documented default rules
+# of SentiStrength.jar, not produced by the jar, so passing this check does not
+# show that the python backend agrees with the jar. --record rewrites them
+# with the output of a jar on the same lists, after which the check compares
+# the scorer with that jar. Run from the repository root:
+#
+#   python benchmarks/check_sentiment_lexicon.py
+#   python benchmarks/check_sentiment_lexicon.py --record senti/SentiStrength.jar
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from csdetector.metrics.sentiStrengthLexicon import SentiStrengthLexicon
+from csdetector.metrics.sentiStrengthPool import SentiStrengthPool
+
+FIXTURE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "sentistrength")
+CORPUS_PATH = os.path.join(FIXTURE_PATH, "corpus.tsv")
+DATA_PATH = os.path.join(FIXTURE_PATH, "SentiStrength_Data") + "/"
+
+
+def readCorpus() -> list:
+    with open(CORPUS_PATH, encoding="utf-8") as f:
+        rows = [line.rstrip("\n").split("\t", 3) for line in f if line.strip()]
+
+    return [((int(positive), int(negative), int(neutral)), text) for positive, negative, neutral, text in rows]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="SentiStrength lexicon scorer regression check")
+    parser.add_argument("--record", metavar="JAR", help="Rewrite the expected scores with the scores of this SentiStrength.jar")
+    args = parser.parse_args()
+
+    corpus = readCorpus()
+    texts = [text for expected, text in corpus]
+
+    if args.record is not None:
+        pool = SentiStrengthPool(args.record, DATA_PATH, 1)
+        scores = pool.getSentiment(texts, score="trinary")
+        pool.close()
+
+        with open(CORPUS_PATH, "w", encoding="utf-8") as f:
+            for (positive, negative, neutral), text in zip(scores, texts):
+                f.write("{}\t{}\t{}\t{}\n".format(positive, negative, neutral, text))
+
+        print("Recorded {} scores of {}".format(len(scores), args.record))
+        sys.exit(0)
+
+    scores = SentiStrengthLexicon(DATA_PATH).getSentiment(texts, score="trinary")
+    mismatches = [(expected, score, text) for (expected, text), score in zip(corpus, scores) if tuple(score) != expected]
+
+    for expected, score, text in mismatches:
+        print("expected {} got {}  {}".format(expected, tuple(score), text))
+
+    print("{}/{} texts agree with the expected scores".format(len(corpus) - len(mismatches), len(corpus)))
+    sys.exit(1 if len(mismatches) > 0 else 0)
@@ -15,6 +15,25 @@ class Configuration:
         googleKey: str,
         startDate: str,
         aliasExtract: bool = False,
+        requestConcurrency: int = 10,
+        requestPoolSize: int = 10,
+        http2: bool = False,
+        responseCache: bool = True,
+        graphql: bool = False,
+        incremental: bool = False,
+        apiUrl: str = "https://api.github.com",
+        recordPath: str = None,
+        excludePullRequests: bool = False,
+        cloneMode: str = "full",
+        shallowClone: bool = False,
+        mirrorPath: str = None,
+        sentiWorkers: int = 4,
+        sentimentCacheSize: int = 1000000,
+        sentiBackend: str = "java",
+        jobs: int = 1,
+        centralityThreshold: int = 1000,
+        centralitySamples: int = 500,
+        centralitySeed: int = 0,
     ):
         self.repositoryUrl = repositoryUrl
         self.batchMonths = batchMonths
@@ -24,6 +43,25 @@ class Configuration:
         self.googleKey = googleKey
         self.startDate = startDate
         self.aliasExtract = aliasExtract
+        self.requestConcurrency = requestConcurrency
+        self.requestPoolSize = requestPoolSize
+        self.http2 = http2
+        self.responseCache = responseCache
+        self.graphql = graphql
+        self.incremental = incremental
+        self.apiUrl = apiUrl
+        self.recordPath = recordPath
+        self.excludePullRequests = excludePullRequests
+        self.cloneMode = cloneMode
+        self.shallowClone = shallowClone
+        self.mirrorPath = mirrorPath
+        self.sentiWorkers = sentiWorkers
+        self.sentimentCacheSize = sentimentCacheSize
+        self.sentiBackend = sentiBackend
+        self.jobs = jobs
+        self.centralityThreshold = centralityThreshold
+        self.centralitySamples = centralitySamples
+        self.centralitySeed = centralitySeed
 
         # parse more than 1 token if it exists
         if "," in pat:
@@ -1,11 +1,12 @@
 import logging
 import os
 from dateutil.relativedelta import relativedelta
-import sentistrength
 from git.repo import Repo
 
 from csdetector import Configuration, utils
 from csdetector.detection.SmellDetection import SmellDetection
+from csdetector.entities.CommitIndex import CommitIndex
+from csdetector.entities.CommitTableCache import CommitTableCache
 from csdetector.github.GitHubRequestController import GitHubRequestController
 from csdetector.metrics.authorAlias import AuthorAlias
 from csdetector.metrics.centralityAnalysis import CentralityAnalysis
@@ -15,12 +16,17 @@ from csdetector.metrics.issueAnalysis import IssueAnalysis
 from csdetector.metrics.politnessAnalysis import PolitnessAnalysis
 from csdetector.metrics.pullRequestAnalysis import PRAnalysis
 from csdetector.metrics.releaseAnalysis import ReleaseAnalysis
+from csdetector.metrics.sentiStrengthLexicon import SentiStrengthLexicon
+from csdetector.metrics.sentiStrengthPool import SentiStrengthPool
+from csdetector.metrics.sentimentCache import SentimentCache
+from csdetector.metrics.sentimentScorer import SentimentScorer
 from csdetector.metrics.tagAnalysis import TagAnalysis
 
 class CommunitySmells:
     _config: Configuration
     _repo: Repo
-    _senti: sentistrength.PySentiStr
+    _senti: SentimentScorer
+    _sentimentCache: SentimentCache
     _request: GitHubRequestController
 
     def __init__(self, config: Configuration):
@@ -36,54 +42,70 @@ class CommunitySmells:
         self._repo = utils.getRepo(self._config)
         
         # setup sentiment analysis
-        self._senti = sentistrength.PySentiStr()
-
         sentiJarPath = os.path.join(
             config.sentiStrengthPath, "SentiStrength.jar").replace("\\", "/")
-        self._senti.setSentiStrengthPath(sentiJarPath)
 
         sentiDataPath = os.path.join(
             config.sentiStrengthPath, "SentiStrength_Data").replace("\\", "/") + "/"
-        self._senti.setSentiStrengthLanguageFolderPath(sentiDataPath)
+
+        # scores are kept for every repository analyzed in the same output path
+        self._sentimentCache = None
+        if config.sentimentCacheSize > 0:
+            self._sentimentCache = SentimentCache(
+                os.path.join(config.outputPath, "sentiment_cache.sqlite"), config.sentimentCacheSize
+            )
+
+        if config.sentiBackend == "python":
+            logging.warning(
+                "The python SentiStrength backend is experimental, its scores can differ from SentiStrength.jar"
+            )
+            self._senti = SentiStrengthLexicon(sentiDataPath, self._sentimentCache, config.jobs)
+        else:
+            self._senti = SentiStrengthPool(sentiJarPath, sentiDataPath, config.sentiWorkers, self._sentimentCache)
         
         self._request = GitHubRequestController(self._config)
         
         logging.info("CSFactory initialized")
 
     def detect(self):
+        # parse the history once, every analysis below reuses the table
+        commitCache = CommitTableCache(os.path.join(self._config.repositoryPath, "commits.npz"))
+        index = CommitIndex(commitCache.load(self._repo))
+        logging.info("Indexed {} commits from {} authors".format(len(index.commits), len(index.emails)))
+
         # A - mine developer aliases
-        authorAliasExtractor = AuthorAlias(self._config, self._repo, self._request)
+        authorAliasExtractor = AuthorAlias(self._config, index, self._request)
 
         if (self._config.aliasExtract):
             authorAliasExtractor.extract()
 
         # B - build social network graphs
         delta = relativedelta(months=+self._config.batchMonths)
-        commits = list(authorAliasExtractor.replaceAliases())
+        commits = authorAliasExtractor.replaceAliases()
 
         commitAnalysis = CommitAnalysis(self._senti, commits, delta, self._config)
         batchDates, authorInfoDict, daysActive = commitAnalysis.extract()
 
 
-        TagAnalysis(self._config, self._repo, delta, batchDates, daysActive).extract()
+        TagAnalysis(self._config, self._repo, commits, delta, batchDates, daysActive).extract()
         cA = CentralityAnalysis(self._config, commits, delta, batchDates)
 
         coreDevs = cA.extract()
 
         ReleaseAnalysis(self._config, self._request).extract(commits, delta, batchDates)
         
-        prA = PRAnalysis(self._config, self._request) 
+        prA = PRAnalysis(self._config, self._request, self._sentimentCache)
         prParticipantBatches, prCommentBatches = prA.extract(self._senti, delta, batchDates, cA)
         logging.info("PR Analysis completed")
 
-        issueA = IssueAnalysis(self._config, self._request)
+        issueA = IssueAnalysis(self._config, self._request, self._sentimentCache)
         issueParticipantBatches, issueCommentBatches = issueA.extract(self._senti, delta, batchDates, cA)
         logging.info("Issue Analysis completed")
 
         # C - Compute Sentiment metrics
         PolitnessAnalysis.calculateACCL(self._config, prCommentBatches, issueCommentBatches)
-        PolitnessAnalysis.calculateRPC(self._config, "PR", prCommentBatches)
-        PolitnessAnalysis.calculateRPC(self._config, "Issue", issueCommentBatches)
+        PolitnessAnalysis.calculateRPC(self._config, "PR", prCommentBatches, self._sentimentCache)
+        PolitnessAnalysis.calculateRPC(self._config, "Issue", issueCommentBatches, self._sentimentCache)
 
         # D - Compute Social metrics
         results = []
@@ -130,6 +152,13 @@ class CommunitySmells:
             # E - Smell Detection with pre-trained models
             results.append(self.__detectSmells(batchIdx, batchDate))
 
+        self._request.close()
+        self._senti.close()
+
+        if self._sentimentCache is not None:
+            self._sentimentCache.logStatistics()
+            self._sentimentCache.close()
+
         detectedSmells, detectedSmellsDict = results[0]
 
         return detectedSmells, detectedSmellsDict
@@ -80,6 +80,180 @@ def initialize_config(entry_args: list[str]):
         type=bool,
     )
     
+    parser.add_argument(
+        "-rc",
+        "--requestConcurrency",
+        help="Maximum number of GitHub API requests kept in flight while crawling PRs and issues. Default=10",
+        required=False,
+        type=int,
+        default=10,
+    )
+
+    parser.add_argument(
+        "-ps",
+        "--poolSize",
+        help="Number of keep-alive connections pooled per GitHub token. Default=10",
+        required=False,
+        type=int,
+        default=10,
+    )
+
+    parser.add_argument(
+        "--http2",
+        help="Use HTTP/2 for GitHub API requests (requires httpx[http2])",
+        required=False,
+        nargs="?",
+        const=True,
+        default=False,
+        type=bool,
+    )
+    
+    parser.add_argument(
+        "-nc",
+        "--noCache",
+        help="Disable the on-disk cache of GitHub API responses used for conditional requests",
+        required=False,
+        nargs="?",
+        const=True,
+        default=False,
+        type=bool,
+    )
+
+    parser.add_argument(
+        "-gql",
+        "--graphql",
+        help="Fetch PRs and issues with bulk GraphQL queries instead of per-item REST calls",
+        required=False,
+        nargs="?",
+        const=True,
+        default=False,
+        type=bool,
+    )
+
+    parser.add_argument(
+        "-inc",
+        "--incremental",
+        help="Keep fetched PRs and issues locally and only request the ones updated since the previous run",
+        required=False,
+        nargs="?",
+        const=True,
+        default=False,
+        type=bool,
+    )
+
+    parser.add_argument(
+        "--apiUrl",
+        help="Base URL of the GitHub API, point it to a GitHubMockServer to replay recorded fixtures. Default=https://api.github.com",
+        required=False,
+        default="https://api.github.com",
+    )
+
+    parser.add_argument(
+        "--record",
+        help="Local directory path where every GitHub API response is recorded as a fixture",
+        required=False,
+    )
+
+    parser.add_argument(
+        "-xpr",
+        "--excludePRsFromIssues",
+        help="Leave pull requests out of the issue metrics (GitHub lists them as issues too)",
+        required=False,
+        nargs="?",
+        const=True,
+        default=False,
+        type=bool,
+    )
+
+    parser.add_argument(
+        "-cm",
+        "--cloneMode",
+        help="How the repository is cloned: full, or metadata for a bare clone without file contents. Default=full",
+        required=False,
+        choices=["full", "metadata"],
+        default="full",
+    )
+
+    parser.add_argument(
+        "-sc",
+        "--shallowClone",
+        help="Only clone the history since the start date (requires --startDate)",
+        required=False,
+        nargs="?",
+        const=True,
+        default=False,
+        type=bool,
+    )
+
+    parser.add_argument(
+        "-mp",
+        "--mirrorPath",
+        help="Local directory path of repository mirrors shared by every output path, refreshed with git fetch on each run",
+        required=False,
+    )
+
+    parser.add_argument(
+        "-sw",
+        "--sentiWorkers",
+        help="Number of SentiStrength processes kept running to score comments and commit messages. Default=4",
+        required=False,
+        type=int,
+        default=4,
+    )
+
+    parser.add_argument(
+        "-scs",
+        "--sentimentCacheSize",
+        help="Maximum number of sentiment, toxicity and politeness scores kept in the output folder cache, 0 disables it. Default=1000000",
+        required=False,
+        type=int,
+        default=1000000,
+    )
+
+    parser.add_argument(
+        "-sb",
+        "--sentiBackend",
+        help="SentiStrength implementation: java runs SentiStrength.jar, python (experimental, not validated against the jar) scores the SentiStrength_Data lists in-process. Default=java",
+        required=False,
+        choices=["java", "python"],
+        default="java",
+    )
+
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        help="Number of worker processes scoring texts with the python SentiStrength backend. Default=1",
+        required=False,
+        type=int,
+        default=1,
+    )
+
+    parser.add_argument(
+        "-ct",
+        "--centralityThreshold",
+        help="Number of developers in a social network above which closeness and betweenness are estimated from sampled pivots. Default=1000",
+        required=False,
+        type=int,
+        default=1000,
+    )
+
+    parser.add_argument(
+        "-ck",
+        "--centralitySamples",
+        help="Number of pivots sampled to estimate closeness and betweenness on large social networks. Default=500",
+        required=False,
+        type=int,
+        default=500,
+    )
+
+    parser.add_argument(
+        "--centralitySeed",
+        help="Seed of the pivot sampling, runs with the same seed give the same estimates. Default=0",
+        required=False,
+        type=int,
+        default=0,
+    )
+
     args = parser.parse_args(entry_args)
 
     #validation of the input inserted by the user
@@ -109,6 +283,30 @@ def initialize_config(entry_args: list[str]):
     except FileNotFoundError:
         raise ValueError("A malformed or invalid senti folder is provided")
 
+    if args.requestConcurrency < 1:
+        raise ValueError("The request concurrency must be at least 1")
+
+    if args.poolSize < 1:
+        raise ValueError("The connection pool size must be at least 1")
+
+    if args.sentiWorkers < 1:
+        raise ValueError("At least one SentiStrength worker is needed")
+
+    if args.jobs < 1:
+        raise ValueError("At least one job is needed")
+
+    if args.centralityThreshold < 0:
+        raise ValueError("The centrality threshold cannot be negative")
+
+    if args.centralitySamples < 1:
+        raise ValueError("At least one centrality pivot is needed")
+
+    if args.sentimentCacheSize < 0:
+        raise ValueError("The sentiment cache size cannot be negative")
+
+    if args.shallowClone and args.startDate is None:
+        raise ValueError("A shallow clone needs a start date")
+
     if args.outputPath is None:
         raise ValueError("A valid output folder is needed to save the analysis of the repository")
 
@@ -127,7 +325,26 @@ def initialize_config(entry_args: list[str]):
         args.pat,
         args.googleKey,
         args.startDate,
-        args.alias
+        args.alias,
+        requestConcurrency=args.requestConcurrency,
+        requestPoolSize=args.poolSize,
+        http2=args.http2,
+        responseCache=not args.noCache,
+        graphql=args.graphql,
+        incremental=args.incremental,
+        apiUrl=args.apiUrl,
+        recordPath=args.record,
+        excludePullRequests=args.excludePRsFromIssues,
+        cloneMode=args.cloneMode,
+        shallowClone=args.shallowClone,
+        mirrorPath=args.mirrorPath,
+        sentiWorkers=args.sentiWorkers,
+        sentimentCacheSize=args.sentimentCacheSize,
+        sentiBackend=args.sentiBackend,
+        jobs=args.jobs,
+        centralityThreshold=args.centralityThreshold,
+        centralitySamples=args.centralitySamples,
+        centralitySeed=args.centralitySeed,
     )
 
     return config, args.debug
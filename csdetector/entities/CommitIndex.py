@@ -0,0 +1,34 @@
+from typing import Dict, List
+import numpy as np
+
+from csdetector.entities.CommitTable import CommitTable
+
+# per-author view of the repository history, computed from the commit table
+# the table keeps the walk order of `git log` (newest first) and is reused by
+# the later analyses instead of walking the history again
+class CommitIndex:
+    def __init__(self, commits: CommitTable) -> None:
+        self._commits = commits
+
+        # first occurrence in the walk is the most recent commit of the author
+        authorIdsInWalk, rows = np.unique(commits.authorIds, return_index=True)
+        order = np.argsort(rows, kind="stable")
+
+        self._shaByEmail = {}
+
+        for authorId, row in zip(authorIdsInWalk[order], rows[order]):
+            email = commits.authors[authorId]
+            self._shaByEmail[email] = commits.sha(row)
+
+    @property
+    def commits(self) -> CommitTable:
+        return self._commits
+
+    @property
+    def emails(self) -> List[str]:
+        return list(self._shaByEmail)
+
+    @property
+    def shaByEmail(self) -> Dict[str, str]:
+        return self._shaByEmail
+
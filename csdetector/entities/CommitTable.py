@@ -0,0 +1,294 @@
+import codecs
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List
+import numpy as np
+from git.exc import GitCommandError
+from git.repo import Repo
+
+# fields of every commit in the `git log` output, the message goes last
+# since it is the only one that can span several lines
+LOG_FORMAT = "%x1e%H%x00%an%x00%ae%x00%ad%x00%cd%x00%B"
+RECORD_SEPARATOR = "\x1e"
+FIELD_SEPARATOR = "\x00"
+
+# columnar view of the repository history, parsed from a single `git log`
+# authors are interned (authorIds index into authors), timezone offsets follow
+# the GitPython convention of seconds west of UTC and all messages share one
+# string buffer sliced by messageOffsets
+class CommitTable:
+    def __init__(
+        self,
+        shas: np.ndarray,
+        authors: List[str],
+        authorIds: np.ndarray,
+        authoredTs: np.ndarray,
+        authoredTz: np.ndarray,
+        committedTs: np.ndarray,
+        committedTz: np.ndarray,
+        messages: str,
+        messageOffsets: np.ndarray,
+    ) -> None:
+        self._shas = shas
+        self._authors = authors
+        self._authorIds = authorIds
+        self._authoredTs = authoredTs
+        self._authoredTz = authoredTz
+        self._committedTs = committedTs
+        self._committedTz = committedTz
+        self._messages = messages
+        self._messageOffsets = messageOffsets
+
+    @staticmethod
+    def fromRepo(repo: Repo, revision: str = "HEAD") -> "CommitTable":
+        builder = CommitTableBuilder()
+        process = repo.git.log(revision, "--format=" + LOG_FORMAT, "--date=raw", as_process=True)
+
+        decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+
+        pending = ""
+        for chunk in iter(lambda: process.stdout.read(1 << 20), b""):
+            pending += decoder.decode(chunk)
+
+            # keep the last, possibly incomplete, record for the next chunk
+            records = pending.split(RECORD_SEPARATOR)
+            pending = records.pop()
+            for record in records:
+                builder.add(record)
+
+        builder.add(pending + decoder.decode(b"", final=True))
+
+        # a failed walk (bad revision, shallow or corrupt repository) leaves a
+        # truncated table, which must not be built or cached under HEAD
+        status = process.proc.wait()
+        if status != 0:
+            raise GitCommandError(process.args, status, process.stderr.read())
+
+        return builder.build()
+
+    @staticmethod
+    def load(path: str) -> "CommitTable":
+        with np.load(path) as data:
+            return CommitTable(
+                data["shas"],
+                data["authors"].tolist(),
+                data["authorIds"],
+                data["authoredTs"],
+                data["authoredTz"],
+                data["committedTs"],
+                data["committedTz"],
+                data["messages"].tobytes().decode("utf-8"),
+                data["messageOffsets"],
+            )
+
+    # messages are stored utf-8 encoded, their offsets still count characters
+    def save(self, file) -> None:
+        np.savez(
+            file,
+            shas=self._shas,
+            authors=np.array(self._authors, dtype=str),
+            authorIds=self._authorIds,
+            authoredTs=self._authoredTs,
+            authoredTz=self._authoredTz,
+            committedTs=self._committedTs,
+            committedTz=self._committedTz,
+            messages=np.frombuffer(self._messages.encode("utf-8"), dtype=np.uint8),
+            messageOffsets=self._messageOffsets,
+        )
+
+    # rows of all tables one after the other, authors are interned again
+    @staticmethod
+    def concat(tables: List["CommitTable"]) -> "CommitTable":
+        authors = []
+        authorIdByName = {}
+        authorIds = []
+
+        for table in tables:
+            remap = np.empty(len(table._authors), dtype=np.int32)
+            for idx, author in enumerate(table._authors):
+                remap[idx] = authorIdByName.setdefault(author, len(authors))
+                if remap[idx] == len(authors):
+                    authors.append(author)
+            authorIds.append(remap[table._authorIds])
+
+        offsets = [np.zeros(1, dtype=np.int64)]
+        shift = 0
+        for table in tables:
+            offsets.append(table._messageOffsets[1:] + shift)
+            shift += len(table._messages)
+
+        return CommitTable(
+            np.concatenate([table._shas for table in tables]).astype("S40"),
+            authors,
+            np.concatenate(authorIds).astype(np.int32),
+            np.concatenate([table._authoredTs for table in tables]).astype(np.int64),
+            np.concatenate([table._authoredTz for table in tables]).astype(np.int32),
+            np.concatenate([table._committedTs for table in tables]).astype(np.int64),
+            np.concatenate([table._committedTz for table in tables]).astype(np.int32),
+            "".join(table._messages for table in tables),
+            np.concatenate(offsets),
+        )
+
+    def __len__(self) -> int:
+        return len(self._shas)
+
+    @property
+    def authors(self) -> List[str]:
+        return self._authors
+
+    @property
+    def authorIds(self) -> np.ndarray:
+        return self._authorIds
+
+    @property
+    def authoredTs(self) -> np.ndarray:
+        return self._authoredTs
+
+    @property
+    def authoredTz(self) -> np.ndarray:
+        return self._authoredTz
+
+    @property
+    def committedTs(self) -> np.ndarray:
+        return self._committedTs
+
+    @property
+    def committedTz(self) -> np.ndarray:
+        return self._committedTz
+
+    def sha(self, idx: int) -> str:
+        return self._shas[idx].decode("ascii")
+
+    def author(self, idx: int) -> str:
+        return self._authors[self._authorIds[idx]]
+
+    def message(self, idx: int) -> str:
+        return self._messages[self._messageOffsets[idx]:self._messageOffsets[idx + 1]]
+
+    def messages(self) -> List[str]:
+        return [self.message(idx) for idx in range(len(self))]
+
+    def committedDatetime(self, idx: int) -> datetime:
+        return toDatetime(self._committedTs[idx], self._committedTz[idx])
+
+    def authoredDatetime(self, idx: int) -> datetime:
+        return toDatetime(self._authoredTs[idx], self._authoredTz[idx])
+
+    # rows at the given positions, in that order
+    def take(self, indices: np.ndarray) -> "CommitTable":
+        indices = np.asarray(indices, dtype=np.int64)
+        messages = [self.message(idx) for idx in indices]
+
+        return CommitTable(
+            self._shas[indices],
+            self._authors,
+            self._authorIds[indices],
+            self._authoredTs[indices],
+            self._authoredTz[indices],
+            self._committedTs[indices],
+            self._committedTz[indices],
+            "".join(messages),
+            messageOffsets(messages),
+        )
+
+    def sortedByCommitDate(self, reverse: bool = False) -> "CommitTable":
+        # stable in both directions, ties keep their original order
+        order = np.argsort(-self._committedTs if reverse else self._committedTs, kind="stable")
+        return self.take(order)
+
+    # commits with start <= commit date < end
+    def between(self, start: datetime, end: datetime) -> "CommitTable":
+        mask = (self._committedTs >= start.timestamp()) & (self._committedTs < end.timestamp())
+        return self.take(np.flatnonzero(mask))
+
+    # same commits with every aliased author replaced by its unique alias
+    def withAliases(self, aliases: Dict[str, str]) -> "CommitTable":
+        authors = []
+        authorIdByName = {}
+        remap = np.empty(len(self._authors), dtype=np.int32)
+
+        for idx, author in enumerate(self._authors):
+            author = aliases.get(author, author)
+            remap[idx] = authorIdByName.setdefault(author, len(authors))
+            if remap[idx] == len(authors):
+                authors.append(author)
+
+        return CommitTable(
+            self._shas,
+            authors,
+            remap[self._authorIds],
+            self._authoredTs,
+            self._authoredTz,
+            self._committedTs,
+            self._committedTz,
+            self._messages,
+            self._messageOffsets,
+        )
+
+
+class CommitTableBuilder:
+    def __init__(self) -> None:
+        self._shas = []
+        self._authors = []
+        self._authorIdByName = {}
+        self._authorIds = []
+        self._authoredTs = []
+        self._authoredTz = []
+        self._committedTs = []
+        self._committedTz = []
+        self._messages = []
+
+    def add(self, record: str) -> None:
+        if len(record) == 0:
+            return
+
+        sha, name, email, authored, committed, message = record.split(FIELD_SEPARATOR, 5)
+
+        # same identity as GitHubRequestHelper.get_author_id, git always reports an email
+        author = email.lower().strip()
+        authorId = self._authorIdByName.setdefault(author, len(self._authors))
+        if authorId == len(self._authors):
+            self._authors.append(author)
+
+        authoredTs, authoredTz = parseRawDate(authored)
+        committedTs, committedTz = parseRawDate(committed)
+
+        self._shas.append(sha)
+        self._authorIds.append(authorId)
+        self._authoredTs.append(authoredTs)
+        self._authoredTz.append(authoredTz)
+        self._committedTs.append(committedTs)
+        self._committedTz.append(committedTz)
+
+        # drop the newline git log writes after every record
+        self._messages.append(message[:-1] if message.endswith("\n") else message)
+
+    def build(self) -> CommitTable:
+        return CommitTable(
+            np.array(self._shas, dtype="S40"),
+            self._authors,
+            np.array(self._authorIds, dtype=np.int32),
+            np.array(self._authoredTs, dtype=np.int64),
+            np.array(self._authoredTz, dtype=np.int32),
+            np.array(self._committedTs, dtype=np.int64),
+            np.array(self._committedTz, dtype=np.int32),
+            "".join(self._messages),
+            messageOffsets(self._messages),
+        )
+
+
+# "1700000000 +0200" -> (1700000000, -7200)
+def parseRawDate(value: str):
+    timestamp, offset = value.split(" ")
+    sign = -1 if offset[0] == "-" else 1
+    utcOffset = sign * (int(offset[1:3]) * 3600 + int(offset[3:5]) * 60)
+    return int(timestamp), -utcOffset
+
+
+def toDatetime(timestamp: int, tzOffset: int) -> datetime:
+    return datetime.fromtimestamp(int(timestamp), timezone(timedelta(seconds=-int(tzOffset))))
+
+
+def messageOffsets(messages: List[str]) -> np.ndarray:
+    offsets = np.zeros(len(messages) + 1, dtype=np.int64)
+    np.cumsum([len(message) for message in messages], out=offsets[1:])
+    return offsets
@@ -0,0 +1,89 @@
+import json
+import logging
+import os
+import tempfile
+from git.exc import GitCommandError
+from git.repo import Repo
+
+from csdetector.entities.CommitTable import CommitTable
+
+# bumped whenever the stored columns change, older caches are parsed again
+CACHE_VERSION = 1
+
+# commit table saved next to the clone and keyed by the HEAD it was parsed at
+# when HEAD moved forward along a linear history only the new commits are
+# parsed and put in front of the cached ones, as `git log` lists them first
+# a merge can bring in commits dated before the cached HEAD that `git log`
+# interleaves with the cached ones, so merges and any other HEAD change parse
+# the whole history again
+# aliases are not part of the cache, they are applied to the loaded table
+class CommitTableCache:
+    def __init__(self, path: str) -> None:
+        self._path = path
+        self._metadataPath = path + ".json"
+
+    def load(self, repo: Repo) -> CommitTable:
+        head = repo.head.commit.hexsha
+        metadata = self._readMetadata()
+
+        if metadata is not None and os.path.exists(self._path):
+            cachedHead = metadata["head"]
+
+            if cachedHead == head:
+                logging.info("Loading commits cached at {}".format(head))
+                return CommitTable.load(self._path)
+
+            if self._isAncestor(repo, cachedHead, head) and not self._hasMerges(repo, cachedHead, head):
+                logging.info("Parsing commits {}..{}".format(cachedHead, head))
+                commits = CommitTable.concat([
+                    CommitTable.fromRepo(repo, "{}..{}".format(cachedHead, head)),
+                    CommitTable.load(self._path),
+                ])
+                self._save(commits, head)
+                return commits
+
+        logging.info("Parsing all commits up to {}".format(head))
+        commits = CommitTable.fromRepo(repo, head)
+        self._save(commits, head)
+        return commits
+
+    def _readMetadata(self):
+        try:
+            with open(self._metadataPath) as f:
+                metadata = json.load(f)
+        except (OSError, ValueError):
+            return None
+
+        if metadata.get("version") != CACHE_VERSION:
+            return None
+
+        return metadata
+
+    def _save(self, commits: CommitTable, head: str) -> None:
+        directory = os.path.dirname(self._path)
+        os.makedirs(directory, exist_ok=True)
+
+        # the metadata is dropped first and written last so a crash in
+        # between never points to a table parsed at another HEAD
+        if os.path.exists(self._metadataPath):
+            os.remove(self._metadataPath)
+
+        with tempfile.NamedTemporaryFile(dir=directory, suffix=".npz", delete=False) as f:
+            commits.save(f)
+        os.replace(f.name, self._path)
+
+        with tempfile.NamedTemporaryFile("w", dir=directory, suffix=".json", delete=False) as f:
+            json.dump(dict(version=CACHE_VERSION, head=head, count=len(commits)), f)
+        os.replace(f.name, self._metadataPath)
+
+    @staticmethod
+    def _isAncestor(repo: Repo, ancestor: str, head: str) -> bool:
+        try:
+            return repo.is_ancestor(ancestor, head)
+        except (GitCommandError, ValueError):
+            # the cached HEAD is no longer in the repository
+            return False
+
+    @staticmethod
+    def _hasMerges(repo: Repo, ancestor: str, head: str) -> bool:
+        return int(repo.git.rev_list("--merges", "--count", "{}..{}".format(ancestor, head))) > 0
@@ -1,13 +1,16 @@
-from datetime import datetime
+from datetime import datetime, timezone
+from dateutil.parser import isoparse
 from typing import List
 
 class Issue:
-    def __init__(self, number: int, createdAt: datetime, closedAt: datetime, comments: List[str], participants: List[str]) -> None:
+    def __init__(self, number: int, createdAt: datetime, closedAt: datetime, comments: List[str], participants: List[str], isOpen: bool = False, isPullRequest: bool = False) -> None:
         self._number = number
         self._createdAt = createdAt
         self._closedAt = closedAt
         self._comments = comments
         self._participants = participants
+        self._isOpen = isOpen
+        self._isPullRequest = isPullRequest
         pass
 
     @property
@@ -29,3 +32,38 @@ class Issue:
     @property
     def participants(self) -> List[str]:
         return self._participants
+
+    @property
+    def isOpen(self) -> bool:
+        return self._isOpen
+
+    # GitHub lists pull requests as issues too
+    @property
+    def isPullRequest(self) -> bool:
+        return self._isPullRequest
+
+    def toDict(self) -> dict:
+        return {
+            "number": self._number,
+            "createdAt": self._createdAt.isoformat(),
+            "closedAt": None if self._isOpen else self._closedAt.isoformat(),
+            "comments": self._comments,
+            "participants": self._participants,
+            "isPullRequest": self._isPullRequest,
+        }
+
+    @staticmethod
+    def fromDict(data: dict) -> "Issue":
+        return Issue(
+            number=data["number"],
+            createdAt=isoparse(data["createdAt"]),
+            closedAt=(
+                datetime.now(timezone.utc)
+                if data["closedAt"] is None
+                else isoparse(data["closedAt"])
+            ),
+            comments=data["comments"],
+            participants=data["participants"],
+            isOpen=data["closedAt"] is None,
+            isPullRequest=data.get("isPullRequest", False),
+        )
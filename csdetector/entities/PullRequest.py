@@ -1,14 +1,16 @@
-from datetime import datetime
+from datetime import datetime, timezone
+from dateutil.parser import isoparse
 from typing import List
 
 class PullRequest:
-    def __init__(self, number: int, createdAt: datetime, closedAt: datetime, comments: List[str], commitCount: int, participants: List[str]) -> None:
+    def __init__(self, number: int, createdAt: datetime, closedAt: datetime, comments: List[str], commitCount: int, participants: List[str], isOpen: bool = False) -> None:
         self._number = number
         self._createdAt = createdAt
         self._closedAt = closedAt
         self._comments = comments
         self._commitCount = commitCount
         self._participants = participants
+        self._isOpen = isOpen
         pass
 
     @property
@@ -34,3 +36,33 @@ class PullRequest:
     @property
     def participants(self) -> List[str]:
         return self._participants
+
+    @property
+    def isOpen(self) -> bool:
+        return self._isOpen
+
+    def toDict(self) -> dict:
+        return {
+            "number": self._number,
+            "createdAt": self._createdAt.isoformat(),
+            "closedAt": None if self._isOpen else self._closedAt.isoformat(),
+            "comments": self._comments,
+            "commitCount": self._commitCount,
+            "participants": self._participants,
+        }
+
+    @staticmethod
+    def fromDict(data: dict) -> "PullRequest":
+        return PullRequest(
+            number=data["number"],
+            createdAt=isoparse(data["createdAt"]),
+            closedAt=(
+                datetime.now(timezone.utc)
+                if data["closedAt"] is None
+                else isoparse(data["closedAt"])
+            ),
+            comments=data["comments"],
+            commitCount=data["commitCount"],
+            participants=data["participants"],
+            isOpen=data["closedAt"] is None,
+        )
@@ -0,0 +1,29 @@
+import threading
+from typing import List
+
+from csdetector.entities.PullRequest import PullRequest
+
+# in-run store of the pull requests fetched by the PR analysis
+# GitHub's issues listing also returns every pull request, the issue crawl
+# reads their comments and participants from here instead of fetching them again
+class GitHubEntityStore:
+    def __init__(self) -> None:
+        self._pullRequests = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._pullRequests)
+
+    @property
+    def pullRequests(self) -> List[PullRequest]:
+        with self._lock:
+            return list(self._pullRequests.values())
+
+    def addPullRequests(self, pullRequests: List[PullRequest]) -> None:
+        with self._lock:
+            for pr in pullRequests:
+                self._pullRequests[pr.number] = pr
+
+    def pullRequest(self, number: int) -> PullRequest:
+        with self._lock:
+            return self._pullRequests.get(number)
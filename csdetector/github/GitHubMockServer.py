@@ -0,0 +1,133 @@
+import argparse
+import glob
+import json
+import logging
+import os
+import threading
+import time
+from flask import Flask, Response, request
+
+from csdetector.github.GitHubRequestRecorder import GitHubRequestRecorder
+
+# local stand-in of the GitHub API replaying fixtures written with --record
+# run the tool with --apiUrl pointing to this server to crawl offline, e.g.
+#
+#   python -m csdetector.github.GitHubMockServer -f fixtures -l 50 --rateLimitEvery 500
+#   python main.py ... --apiUrl http://127.0.0.1:8080
+#
+# latency and rate limit bursts can be injected to benchmark the fetch layer
+class GitHubMockServer:
+    def __init__(
+        self,
+        fixturesPath: str,
+        latency: float = 0,
+        rateLimitEvery: int = 0,
+        rateLimitBurst: int = 1,
+        rateLimitReset: float = 1,
+        retryAfter: float = None,
+    ) -> None:
+        self._latency = latency
+        self._rateLimitEvery = rateLimitEvery
+        self._rateLimitBurst = rateLimitBurst
+        self._rateLimitReset = rateLimitReset
+        self._retryAfter = retryAfter
+        self._lock = threading.Lock()
+        self._requestCount = 0
+        self._fixtures = {}
+
+        for path in glob.glob(os.path.join(fixturesPath, "*.json")):
+            with open(path) as f:
+                fixture = json.load(f)
+            key = GitHubRequestRecorder.fixtureKey(fixture["method"], fixture["url"], fixture["payload"])
+            self._fixtures[key] = fixture
+
+        logging.info("Loaded {} fixtures from {}".format(len(self._fixtures), fixturesPath))
+
+        self.app = Flask(__name__)
+        self.app.add_url_rule("/", "api", self._serve, methods=["GET", "POST"])
+        self.app.add_url_rule("/<path:path>", "api", self._serve, methods=["GET", "POST"])
+
+    @property
+    def requestCount(self) -> int:
+        return self._requestCount
+
+    def run(self, host: str = "127.0.0.1", port: int = 8080):
+        self.app.run(host=host, port=port, threaded=True)
+
+    def _serve(self, path: str = ""):
+        with self._lock:
+            self._requestCount += 1
+            count = self._requestCount
+
+        if self._latency > 0:
+            time.sleep(self._latency / 1000)
+
+        if self._isRateLimited(count):
+            return self._rateLimited()
+
+        payload = request.get_json(silent=True) if request.method == "POST" else None
+        key = GitHubRequestRecorder.fixtureKey(request.method, request.full_path, payload)
+        fixture = self._fixtures.get(key)
+
+        if fixture is None:
+            return self._json(404, {"message": "Not Found"}, {})
+
+        headers = dict(fixture["headers"])
+        headers.update(self._rateLimitHeaders(count))
+        return Response(fixture["body"], status=fixture["status"], headers=headers)
+
+    # every rateLimitEvery requests, the next rateLimitBurst requests are refused
+    def _isRateLimited(self, count: int) -> bool:
+        if self._rateLimitEvery <= 0:
+            return False
+
+        return (count - 1) % (self._rateLimitEvery + self._rateLimitBurst) >= self._rateLimitEvery
+
+    def _rateLimited(self):
+        if self._retryAfter is not None:
+            return self._json(
+                403,
+                {"message": "You have exceeded a secondary rate limit."},
+                {"Retry-After": str(self._retryAfter)},
+            )
+
+        headers = {
+            "X-RateLimit-Limit": "5000",
+            "X-RateLimit-Remaining": "0",
+            "X-RateLimit-Reset": str(int(time.time() + self._rateLimitReset)),
+        }
+        return self._json(403, {"message": "API rate limit exceeded"}, headers)
+
+    @staticmethod
+    def _rateLimitHeaders(count: int) -> dict:
+        return {
+            "X-RateLimit-Limit": "5000",
+            "X-RateLimit-Remaining": str(5000 - count % 5000),
+            "X-RateLimit-Reset": str(int(time.time() + 3600)),
+        }
+
+    @staticmethod
+    def _json(status: int, body: dict, headers: dict):
+        return Response(json.dumps(body), status=status, headers=headers, content_type="application/json")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Replay recorded GitHub API fixtures locally.")
+    parser.add_argument("-f", "--fixtures", help="Directory written by --record", required=True)
+    parser.add_argument("-p", "--port", type=int, default=8080)
+    parser.add_argument("-l", "--latency", help="Latency added to every answer, in milliseconds", type=float, default=0)
+    parser.add_argument("--rateLimitEvery", help="Requests served between rate limit bursts, 0 disables them", type=int, default=0)
+    parser.add_argument("--rateLimitBurst", help="Requests refused in each burst", type=int, default=1)
+    parser.add_argument("--rateLimitReset", help="Seconds until a rate limited token is reset", type=float, default=1)
+    parser.add_argument("--retryAfter", help="Answer bursts as secondary rate limits with this Retry-After", type=float)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    GitHubMockServer(
+        args.fixtures,
+        args.latency,
+        args.rateLimitEvery,
+        args.rateLimitBurst,
+        args.rateLimitReset,
+        args.retryAfter,
+    ).run(port=args.port)
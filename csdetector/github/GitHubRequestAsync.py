@@ -0,0 +1,100 @@
+import asyncio
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Awaitable, Callable, List
+
+# asyncio engine used by the controller to crawl paginated listings
+# every blocking call made through it shares one semaphore, so the number of
+# page and per-item requests in flight never exceeds maxConcurrency
+# failedPages counts the pages of the last crawl that got no response
+class GitHubRequestAsync:
+    _maxConcurrency: int
+
+    def __init__(self, maxConcurrency: int) -> None:
+        self._maxConcurrency = max(1, maxConcurrency)
+        self._semaphore = None
+        self._executor = None
+        self.failedPages = 0
+
+    def crawl(self, pageUrls: List[str], requestPage: Callable, buildItem: Callable[[dict], Awaitable]) -> List:
+        self.failedPages = 0
+
+        if len(pageUrls) == 0:
+            return []
+
+        async def crawlPages():
+            # pages keep their original order, items keep their order within a page
+            pages = await asyncio.gather(
+                *(self._crawlPage(url, requestPage, buildItem) for url in pageUrls)
+            )
+            return [item for page in pages for item in page]
+
+        return self.run(crawlPages)
+
+    # walks a listing sorted by most recently updated, page after page, until
+    # it reaches an item that was not updated; items of a page are built concurrently
+    def crawlUpdated(self, pageUrl: Callable[[int], str], requestPage: Callable, buildItem: Callable[[dict], Awaitable], isUpdated: Callable[[dict], bool]) -> List:
+        self.failedPages = 0
+
+        async def crawlPages():
+            items = []
+            page = 1
+
+            while True:
+                logging.info("Querying {}".format(pageUrl(page)))
+                response = await self.call(requestPage, pageUrl(page))
+
+                if response is None:
+                    self.failedPages += 1
+                    break
+
+                data = response.json()
+                updated = [value for value in data if isUpdated(value)]
+                items.extend(await asyncio.gather(*(buildItem(value) for value in updated)))
+
+                if len(updated) < len(data) or "next" not in response.links:
+                    break
+                page += 1
+
+            return items
+
+        return self.run(crawlPages)
+
+    # calls fn on every item concurrently, results keep the order of the items
+    def map(self, fn: Callable, items: List) -> List:
+        if len(items) == 0:
+            return []
+
+        async def callAll():
+            return await asyncio.gather(*(self.call(fn, item) for item in items))
+
+        return self.run(callAll)
+
+    def run(self, main: Callable[[], Awaitable]):
+        return asyncio.run(self._run(main))
+
+    async def call(self, fn: Callable, *args):
+        loop = asyncio.get_running_loop()
+        async with self._semaphore:
+            return await loop.run_in_executor(self._executor, fn, *args)
+
+    async def _run(self, main: Callable[[], Awaitable]):
+        self._semaphore = asyncio.Semaphore(self._maxConcurrency)
+
+        with ThreadPoolExecutor(max_workers=self._maxConcurrency) as executor:
+            self._executor = executor
+            try:
+                return await main()
+            finally:
+                self._executor = None
+                self._semaphore = None
+
+    async def _crawlPage(self, url: str, requestPage: Callable, buildItem: Callable[[dict], Awaitable]) -> List:
+        logging.info("Querying {}".format(url))
+        response = await self.call(requestPage, url)
+
+        if response is None:
+            self.failedPages += 1
+            return []
+
+        return await asyncio.gather(*(buildItem(data) for data in response.json()))
@@ -1,22 +1,50 @@
-from typing import List
+import asyncio
+import logging
+from datetime import datetime, timezone
+from typing import Iterator, List
+from dateutil.parser import isoparse
 from csdetector import Configuration
+from csdetector.entities.Issue import Issue
+from csdetector.entities.PullRequest import PullRequest
+from csdetector.github.GitHubEntityStore import GitHubEntityStore
+from csdetector.github.GitHubRequestAsync import GitHubRequestAsync
+from csdetector.github.GitHubRequestGraphQL import GitHubRequestGraphQL
 from csdetector.github.GitHubRequestHelper import GitHubRequestHelper
+from csdetector.github.GitHubRequestIssuesGraphQL import GitHubRequestIssuesGraphQL
+from csdetector.github.GitHubRequestPaginator import GitHubRequestPaginator
+from csdetector.github.GitHubRequestPullRequestGraphQL import GitHubRequestPullRequestGraphQL
+from csdetector.github.GitHubResquestCommits import GitHubRequestCommits
+from csdetector.github.GitHubSyncStore import GitHubSyncStore
 from csdetector.github.GitHubRequestStrategy import GitHubRequestStrategy
 
 class GitHubRequestController:
     _request: GitHubRequestHelper
     _strategy: GitHubRequestStrategy
+    _engine: GitHubRequestAsync
+    _paginator: GitHubRequestPaginator
+    _store: GitHubEntityStore
+
+    # set when a listing page could not be fetched, the crawl result is partial
+    _incomplete: bool = False
 
     @classmethod
     def __init__(cls, config: Configuration) -> None:
         cls._request = GitHubRequestHelper()
         cls._request.init_tokens(config)
+        cls._engine = GitHubRequestAsync(config.requestConcurrency)
+        cls._paginator = GitHubRequestPaginator(cls._request, config.requestConcurrency)
+        cls._store = GitHubEntityStore()
         pass
 
     @property
     def request(self):
         return self._request
 
+    @classmethod
+    def close(cls):
+        cls._paginator.close()
+        cls._request.close()
+
     @classmethod
     def setStrategy(cls, strategy):
         cls._strategy = strategy
@@ -25,20 +53,14 @@ class GitHubRequestController:
     @classmethod
     def requestComments(cls, urlComments: str) -> List[str]:
         comments = []
-        responseComments = cls._request.request(urlComments)
-        if responseComments is not None:
-            for comment in responseComments.json():
-                comments.append(comment["body"])
+        for comment in cls._paginator.items(urlComments):
+            comments.append(comment["body"])
 
         return comments
 
     @classmethod
     def requestTotalCommits(cls, urlCommits: str) -> int:
-        responseCommits = cls._request.request(urlCommits)
-        if responseCommits is not None:
-            return len(responseCommits.json())
-
-        return 0
+        return sum(1 for _ in cls._paginator.items(urlCommits))
 
     @classmethod
     def requestParticipants(cls, config: Configuration, number: int) -> List[str]:
@@ -46,25 +68,34 @@ class GitHubRequestController:
             config.repositoryOwner, config.repositoryName, number
         )
         participants = []
-        responseParticipants = cls._request.request(url)
-        if responseParticipants is not None:
-            for participant in responseParticipants.json():
-                if participant is None or participant["actor"] is None or participant["actor"]["login"] is None:
-                    login = None
-                else:
-                    login = participant["actor"]["login"]
+        for participant in cls._paginator.items(url):
+            if participant is None or participant["actor"] is None or participant["actor"]["login"] is None:
+                login = None
+            else:
+                login = participant["actor"]["login"]
 
-                if login is not None and login not in participants:
-                    participants.append(login)
+            if login is not None and login not in participants:
+                participants.append(login)
 
         return participants
 
+    # streams the repository commit listing, 100 commits with their GitHub author per page
+    @classmethod
+    def requestCommitListing(cls, config: Configuration) -> Iterator[dict]:
+        return cls._paginator.items(GitHubRequestCommits.urlRequestPerPage(config, 1))
+
+    @classmethod
+    def requestConcurrently(cls, urls: List[str]) -> list:
+        return cls._engine.map(cls._request.request, urls)
+
     @classmethod
     def numberOfPages(cls, config: Configuration) -> int:
         url = cls._strategy.urlNumberOfPages(config)
         response = cls._request.request(url)
 
+        # only the first page is crawled then
         if response is None:
+            cls._incomplete = True
             return 1
 
         try:
@@ -79,3 +110,228 @@ class GitHubRequestController:
     def requestPerPage(cls, config: Configuration, page: int):
         url = cls._strategy.urlRequestPerPage(config, page)
         return cls._request.request(url)
+
+    @classmethod
+    def requestPullRequests(cls, config: Configuration) -> List[PullRequest]:
+        if config.incremental:
+            pullRequests = cls._synchronize(config, "pullRequests", PullRequest.fromDict, cls._fetchPullRequests)
+        else:
+            pullRequests = cls._fetchPullRequests(config, None)
+
+        # shared with the issue crawl, which sees every PR again
+        cls._store.addPullRequests(pullRequests)
+        return pullRequests
+
+    @classmethod
+    def requestIssues(cls, config: Configuration) -> List[Issue]:
+        if config.incremental:
+            issues = cls._synchronize(config, "issues", Issue.fromDict, cls._fetchIssues)
+        else:
+            issues = cls._fetchIssues(config, None)
+
+        # the synchronized store can hold pull requests from runs that kept them
+        if config.excludePullRequests:
+            return [issue for issue in issues if not issue.isPullRequest]
+
+        return issues
+
+    # fetches all PRs, or only the ones updated since the given date
+    @classmethod
+    def _fetchPullRequests(cls, config: Configuration, since: datetime) -> List[PullRequest]:
+        if config.graphql:
+            return cls._requestGraphQL(config, GitHubRequestPullRequestGraphQL, since)
+
+        async def build(data: dict) -> PullRequest:
+            comments, participants, commitCount = await asyncio.gather(
+                cls._engine.call(cls.requestComments, data["comments_url"]),
+                cls._engine.call(cls.requestParticipants, config, data["number"]),
+                cls._engine.call(cls.requestTotalCommits, data["commits_url"]),
+            )
+
+            createdAt, closedAt = cls._parseDates(data)
+            return PullRequest(
+                number=data["number"],
+                createdAt=createdAt,
+                closedAt=closedAt,
+                comments=comments,
+                commitCount=commitCount,
+                participants=participants,
+                isOpen=data["closed_at"] is None,
+            )
+
+        return cls._crawl(config, build, since)
+
+    # fetches all issues, or only the ones updated since the given date
+    @classmethod
+    def _fetchIssues(cls, config: Configuration, since: datetime) -> List[Issue]:
+        if config.graphql:
+            issues = cls._requestGraphQL(config, GitHubRequestIssuesGraphQL, since)
+
+            if config.excludePullRequests:
+                return issues
+
+            # the REST issues listing also returns pull requests, keep the same item set
+            if len(cls._store) > 0:
+                pullRequests = cls._store.pullRequests
+            else:
+                pullRequests = cls._requestGraphQL(config, GitHubRequestPullRequestGraphQL, since)
+
+            issues.extend(cls._issueFromPullRequest(pr) for pr in pullRequests)
+            issues.sort(key=lambda issue: issue.createdAt, reverse=True)
+            return issues
+
+        async def build(data: dict) -> Issue:
+            if "pull_request" in data:
+                if config.excludePullRequests:
+                    return None
+
+                pr = cls._store.pullRequest(data["number"])
+                if pr is not None:
+                    return cls._issueFromPullRequest(pr)
+
+            comments, participants = await asyncio.gather(
+                cls._engine.call(cls.requestComments, data["comments_url"]),
+                cls._engine.call(cls.requestParticipants, config, data["number"]),
+            )
+
+            createdAt, closedAt = cls._parseDates(data)
+            return Issue(
+                number=data["number"],
+                createdAt=createdAt,
+                closedAt=closedAt,
+                comments=comments,
+                participants=participants,
+                isOpen=data["closed_at"] is None,
+                isPullRequest="pull_request" in data,
+            )
+
+        # excluded pull requests are built as None, drop them before the sync store merges the items
+        return [issue for issue in cls._crawl(config, build, since) if issue is not None]
+
+    @staticmethod
+    def _issueFromPullRequest(pr: PullRequest) -> Issue:
+        return Issue(
+            number=pr.number,
+            createdAt=pr.createdAt,
+            closedAt=pr.closedAt,
+            comments=pr.comments,
+            participants=pr.participants,
+            isOpen=pr.isOpen,
+            isPullRequest=True,
+        )
+
+    @classmethod
+    def _synchronize(cls, config: Configuration, kind: str, fromDict, fetch) -> list:
+        store = GitHubSyncStore(config, kind, fromDict)
+
+        # taken before crawling so items updated during the crawl are fetched again next time,
+        # in whole seconds as the updated_at dates of GitHub
+        startedAt = datetime.now(timezone.utc).replace(microsecond=0)
+        since = None if store.watermark is None else store.watermark.replace(microsecond=0)
+
+        cls._incomplete = False
+        store.merge(fetch(config, since))
+
+        # the items on the missing pages must still be fetched by the next run
+        if cls._incomplete:
+            logging.warning("Some {} pages could not be fetched, keeping the watermark {}".format(kind, store.watermark))
+            if store.watermark is not None:
+                store.save(store.watermark)
+        else:
+            store.save(startedAt)
+
+        return store.items
+
+    @classmethod
+    def _crawl(cls, config: Configuration, build, since: datetime = None) -> list:
+        if since is None:
+            pages = cls.numberOfPages(config)
+            urls = [cls._strategy.urlRequestPerPage(config, page) for page in range(1, pages + 1)]
+
+            items = cls._engine.crawl(urls, cls._request.request, build)
+        else:
+            sinceStr = since.astimezone(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+            items = cls._engine.crawlUpdated(
+                lambda page: cls._strategy.urlRequestUpdatedPerPage(config, page, sinceStr),
+                cls._request.request,
+                build,
+                lambda data: isoparse(data["updated_at"]) >= since,
+            )
+
+        if cls._engine.failedPages > 0:
+            cls._incomplete = True
+
+        return items
+
+    @classmethod
+    def _requestGraphQL(cls, config: Configuration, strategy: GitHubRequestGraphQL, since: datetime = None) -> list:
+        items = []
+        cursor = None
+        reachedWatermark = False
+
+        while True:
+            data = cls._request.requestGraphQL(
+                strategy.query("CREATED_AT" if since is None else "UPDATED_AT"),
+                {"owner": config.repositoryOwner, "name": config.repositoryName, "cursor": cursor},
+            )
+
+            if data is None or data.get("repository") is None:
+                cls._incomplete = True
+                break
+
+            connection = strategy.connection(data)
+            for node in connection["nodes"]:
+                if node is None:
+                    continue
+
+                # sorted by update date, everything after this node is unchanged
+                if since is not None and isoparse(node["updatedAt"]) < since:
+                    reachedWatermark = True
+                    break
+
+                comments = cls._requestGraphQLNested(config, strategy, node, "comments", "body")
+                participants = cls._requestGraphQLNested(config, strategy, node, "participants", "login")
+                items.append(strategy.build(node, comments, participants))
+
+            logging.info("Retrieved {} items through GraphQL".format(len(items)))
+
+            if reachedWatermark or not connection["pageInfo"]["hasNextPage"]:
+                break
+            cursor = connection["pageInfo"]["endCursor"]
+
+        return items
+
+    @classmethod
+    def _requestGraphQLNested(cls, config: Configuration, strategy: GitHubRequestGraphQL, node: dict, field: str, key: str) -> list:
+        connection = node[field]
+        values = [value[key] for value in connection["nodes"] if value is not None]
+
+        # only long threads need more than the page embedded in the item query
+        while connection["pageInfo"]["hasNextPage"]:
+            data = cls._request.requestGraphQL(
+                strategy.nestedQuery(field),
+                {
+                    "owner": config.repositoryOwner,
+                    "name": config.repositoryName,
+                    "number": node["number"],
+                    "cursor": connection["pageInfo"]["endCursor"],
+                },
+            )
+
+            if data is None or data.get("repository") is None:
+                break
+
+            connection = data["repository"]["issueOrPullRequest"][field]
+            values.extend(value[key] for value in connection["nodes"] if value is not None)
+
+        return values
+
+    @staticmethod
+    def _parseDates(data: dict):
+        createdAt = isoparse(data["created_at"])
+        closedAt = (
+            datetime.now(timezone.utc)
+            if data["closed_at"] is None
+            else isoparse(data["closed_at"])
+        )
+        return createdAt, closedAt
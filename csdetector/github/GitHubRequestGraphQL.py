@@ -0,0 +1,46 @@
+from abc import ABC, abstractmethod
+
+# page size used by every GraphQL connection, the maximum GitHub accepts
+PAGE_SIZE = 100
+
+# query used to read the remaining pages of a nested connection (comments or
+# participants) when an item has more than PAGE_SIZE entries
+NESTED_CONNECTION_QUERY = """
+query($owner: String!, $name: String!, $number: Int!, $cursor: String) {
+  repository(owner: $owner, name: $name) {
+    issueOrPullRequest(number: $number) {
+      ... on Issue { %(field)s(first: %(size)d, after: $cursor) { %(selection)s } }
+      ... on PullRequest { %(field)s(first: %(size)d, after: $cursor) { %(selection)s } }
+    }
+  }
+}
+"""
+
+COMMENTS_SELECTION = "pageInfo { hasNextPage endCursor } nodes { body }"
+PARTICIPANTS_SELECTION = "pageInfo { hasNextPage endCursor } nodes { login }"
+
+class GitHubRequestGraphQL(ABC):
+
+    # paged query over the repository items, receives $owner, $name and $cursor
+    # items are sorted by the orderBy field (CREATED_AT or UPDATED_AT), newest first
+    @staticmethod
+    @abstractmethod
+    def query(orderBy: str = "CREATED_AT") -> str:
+        pass
+
+    # the items connection inside the query result
+    @staticmethod
+    @abstractmethod
+    def connection(data: dict) -> dict:
+        pass
+
+    # entity built from a node once its nested connections are complete
+    @staticmethod
+    @abstractmethod
+    def build(node: dict, comments: list, participants: list):
+        pass
+
+    @staticmethod
+    def nestedQuery(field: str) -> str:
+        selection = COMMENTS_SELECTION if field == "comments" else PARTICIPANTS_SELECTION
+        return NESTED_CONNECTION_QUERY % dict(field=field, size=PAGE_SIZE, selection=selection)
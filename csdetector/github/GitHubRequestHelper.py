@@ -1,10 +1,30 @@
-import requests
+import contextlib
 import logging
+import os
+import threading
+import time
 import git 
 from csdetector import Configuration
+from csdetector.github.GitHubRequestRecorder import GITHUB_API_URL, GitHubRequestRecorder
+from csdetector.github.GitHubRequestSession import GitHubRequestSession
+from csdetector.github.GitHubResponseCache import GitHubResponseCache
+from csdetector.github.GitHubTokenScheduler import CORE_RESOURCE, GRAPHQL_RESOURCE, GitHubTokenScheduler
+
+# transient failures (network errors and 5xx answers) are retried this many times
+MAX_RETRIES = 3
+# pause applied to a token on a secondary rate limit without Retry-After
+SECONDARY_LIMIT_PAUSE = 60
+
+GRAPHQL_URL = GITHUB_API_URL + "/graphql"
 
 class GitHubRequestHelper:
-    _tokens = []
+    _scheduler: GitHubTokenScheduler = GitHubTokenScheduler([])
+    _sessions = {}
+    _cache: GitHubResponseCache = None
+    _recorder: GitHubRequestRecorder = None
+    _apiUrl: str = GITHUB_API_URL
+    # bounds the HTTP requests in flight across the crawl engine and the paginator threads
+    _inFlight = contextlib.nullcontext()
     
     @staticmethod
     def get_author_id(author: git.Actor):
@@ -17,26 +37,163 @@ class GitHubRequestHelper:
 
     @classmethod
     def init_tokens(cls, config: Configuration):
-        cls._tokens = config.pat.copy()
+        cls.close()
+        cls._scheduler = GitHubTokenScheduler(config.pat)
+        cls._sessions = {
+            token: GitHubRequestSession(token, config.requestPoolSize, config.http2)
+            for token in config.pat
+        }
+        cls._inFlight = threading.BoundedSemaphore(max(1, config.requestConcurrency))
+
+        if config.responseCache:
+            cls._cache = GitHubResponseCache(os.path.join(config.repositoryPath, "github_cache.sqlite"))
+
+        # requests can be served by a local stand-in of the API and recorded to fixtures
+        cls._apiUrl = config.apiUrl.rstrip("/")
+        cls._recorder = GitHubRequestRecorder(config.recordPath) if config.recordPath is not None else None
 
     @classmethod
     def request(cls, url):
-        tokens = cls._tokens.copy()
+        return cls._send("GET", url)
+
+    @classmethod
+    def requestGraphQL(cls, query: str, variables: dict):
+        payload = {"query": query, "variables": variables}
+        response = cls._send("POST", GRAPHQL_URL, payload=payload)
+
+        if response is None:
+            return None
+
+        result = response.json()
+        for error in result.get("errors", []):
+            logging.warning("GraphQL query failed with error {}".format(error.get("message")))
+
+        return result.get("data")
 
-        if len(tokens) == 0:
-            logging.error("No tokens available for GitHub API requests")
-            raise Exception("No tokens available for GitHub API requests")
+    @classmethod
+    def _send(cls, method: str, url: str, payload: dict = None):
+        failures = 0
+        graphql = method == "POST"
+        resource = GRAPHQL_RESOURCE if graphql else CORE_RESOURCE
+        target = cls._apiUrl + url[len(GITHUB_API_URL):] if url.startswith(GITHUB_API_URL) else url
+
+        while True:
+            token = cls._scheduler.acquire(resource)
+
+            # ETags are only valid for the token they were served to
+            cached = cls._cache.lookup(url, token) if cls._cache is not None and not graphql else None
 
-        for i in range(len(tokens)):
             try:
-                headers = {'Authorization': 'token ' + tokens[i]}
-                logging.debug("Requesting {} with token {}".format(url, i))
-                response = requests.get(url, headers=headers)
-                if response.status_code == 200:
-                    return response
-                else:
-                    logging.warning("Token {} failed with status code {}".format(tokens[i], response.status_code))
-                    cls._tokens.pop(i)
+                logging.debug("Requesting {}".format(url))
+                session = cls._sessions[token]
+                with cls._inFlight:
+                    if graphql:
+                        response = session.post(target, json=payload)
+                    else:
+                        response = session.get(target, headers=cached.conditionalHeaders() if cached is not None else None)
             except Exception as e:
-                logging.warning("Token {} failed with exception {}".format(tokens[i], e))
-                cls._tokens.pop(i)
+                failures += 1
+                logging.warning("Request to {} failed with exception {}".format(url, e))
+                if failures > MAX_RETRIES:
+                    return None
+                time.sleep(2 ** failures)
+                continue
+
+            cls._scheduler.update(token, resource, response.headers)
+            status = response.status_code
+
+            # GraphQL may report an exhausted budget inside a 200 answer
+            if status == 200 and graphql and cls._isGraphQLRateLimited(response):
+                cls._handleRateLimit(token, resource, response)
+                continue
+
+            if status == 200:
+                if cls._cache is not None and not graphql:
+                    cls._cache.miss()
+                    cls._cache.store(url, token, response)
+                if cls._recorder is not None:
+                    cls._recorder.record(method, url, payload, response)
+                return response
+
+            # not modified since the cached copy
+            if status == 304 and cached is not None:
+                cls._cache.hit()
+                response = cached.toResponse()
+                if cls._recorder is not None:
+                    cls._recorder.record(method, url, payload, response)
+                return response
+
+            # bad credentials, the token itself is unusable
+            if status == 401:
+                cls._scheduler.invalidate(token)
+                continue
+
+            if status == 403 or status == 429:
+                if cls._handleRateLimit(token, resource, response):
+                    continue
+
+                logging.warning("Access to {} is forbidden (status code {})".format(url, status))
+                return None
+
+            if status >= 500:
+                failures += 1
+                logging.warning("Request to {} failed with status code {}".format(url, status))
+                if failures > MAX_RETRIES:
+                    return None
+                time.sleep(2 ** failures)
+                continue
+
+            # 404 for deleted resources, 410, 422... nothing to retry
+            logging.warning("Request to {} failed with status code {}".format(url, status))
+            return None
+
+    @staticmethod
+    def _isGraphQLRateLimited(response) -> bool:
+        try:
+            errors = response.json().get("errors", [])
+        except ValueError:
+            return False
+
+        return any(error.get("type") == "RATE_LIMITED" for error in errors)
+
+    @classmethod
+    def _handleRateLimit(cls, token: str, resource: str, response) -> bool:
+        headers = response.headers
+        resource = headers.get("X-RateLimit-Resource") or resource
+
+        # secondary rate limits tell how long to back off
+        retryAfter = headers.get("Retry-After")
+        if retryAfter is not None:
+            try:
+                cls._scheduler.pause(token, float(retryAfter))
+            except ValueError:
+                cls._scheduler.pause(token, SECONDARY_LIMIT_PAUSE)
+            return True
+
+        # primary rate limit, the token can be used again after the reset
+        if headers.get("X-RateLimit-Remaining") == "0":
+            reset = headers.get("X-RateLimit-Reset")
+            cls._scheduler.exhaust(token, resource, float(reset) if reset is not None else time.time() + 3600)
+            return True
+
+        if "secondary rate limit" in response.text.lower():
+            cls._scheduler.pause(token, SECONDARY_LIMIT_PAUSE)
+            return True
+
+        if cls._isGraphQLRateLimited(response):
+            reset = headers.get("X-RateLimit-Reset")
+            cls._scheduler.exhaust(token, resource, float(reset) if reset is not None else time.time() + 3600)
+            return True
+
+        return False
+
+    @classmethod
+    def close(cls):
+        for session in cls._sessions.values():
+            session.close()
+        cls._sessions = {}
+
+        if cls._cache is not None:
+            cls._cache.logStatistics()
+            cls._cache.close()
+            cls._cache = None
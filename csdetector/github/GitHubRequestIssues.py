@@ -19,3 +19,9 @@ class GitHubRequestIssues(GitHubRequestStrategy):
         return "https://api.github.com/repos/{}/{}/issues/{}/comments".format(
             config.repositoryOwner, config.repositoryName, number
         )
+
+    @staticmethod
+    def urlRequestUpdatedPerPage(config: Configuration, page: int, since: str) -> str:
+        return "https://api.github.com/repos/{}/{}/issues?state=all&sort=updated&direction=desc&since={}&per_page=100&page={}".format(
+            config.repositoryOwner, config.repositoryName, since, page
+        )
@@ -0,0 +1,71 @@
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterator
+from urllib.parse import parse_qs, urlencode, urlsplit, urlunsplit
+
+from csdetector.github.GitHubRequestHelper import GitHubRequestHelper
+
+# page size requested for every paginated sub-resource, the maximum GitHub accepts
+PAGE_SIZE = 100
+
+# reads every page of a paginated REST listing (comments, events, commits)
+# the page count comes from the Link header of the first answer, the other
+# pages are fetched concurrently and their items are yielded in order while
+# at most maxConcurrency pages are held in memory, closing the generator early
+# cancels the pages not requested yet
+class GitHubRequestPaginator:
+    def __init__(self, request: GitHubRequestHelper, maxConcurrency: int) -> None:
+        self._request = request
+        self._maxConcurrency = max(1, maxConcurrency)
+        # not shared with the crawl engine, its workers wait on these pages, the
+        # requests of both count against the same in-flight limit of the helper
+        self._executor = ThreadPoolExecutor(max_workers=self._maxConcurrency)
+
+    def items(self, url: str) -> Iterator[dict]:
+        response = self._request.request(self.pageUrl(url, 1))
+
+        if response is None:
+            return
+
+        yield from response.json()
+
+        pages = deque()
+        nextPage = 2
+        lastPage = self.lastPage(response)
+
+        try:
+            while nextPage <= lastPage or len(pages) > 0:
+                while nextPage <= lastPage and len(pages) < self._maxConcurrency:
+                    pages.append(self._executor.submit(self._request.request, self.pageUrl(url, nextPage)))
+                    nextPage += 1
+
+                response = pages.popleft().result()
+                if response is not None:
+                    yield from response.json()
+        finally:
+            # the caller stopped reading, prefetched pages not started yet are
+            # dropped so they do not spend rate limit budget
+            for page in pages:
+                page.cancel()
+
+    def close(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    @staticmethod
+    def pageUrl(url: str, page: int) -> str:
+        parts = urlsplit(url)
+        query = parse_qs(parts.query)
+        query["per_page"] = [str(PAGE_SIZE)]
+        query["page"] = [str(page)]
+        return urlunsplit(parts._replace(query=urlencode(query, doseq=True)))
+
+    @staticmethod
+    def lastPage(response) -> int:
+        last = response.links.get("last")
+        if last is None:
+            return 1
+
+        try:
+            return int(parse_qs(urlsplit(last["url"]).query)["page"][0])
+        except (KeyError, ValueError):
+            return 1
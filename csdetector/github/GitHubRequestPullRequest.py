@@ -16,6 +16,13 @@ class GitHubRequestPullRequest(GitHubRequestStrategy):
 
     @staticmethod
     def urlRequestComments(config: Configuration, number: int) -> str:
-        return "https://api.github.com/repos/{}/{}/pulls/{}/comments?per_page=100&page=1".format(
+        return "https://api.github.com/repos/{}/{}/pulls/{}/comments".format(
             config.repositoryOwner, config.repositoryName, number
         )
+
+    # the pulls endpoint has no since filter, results are sorted by update date instead
+    @staticmethod
+    def urlRequestUpdatedPerPage(config: Configuration, page: int, since: str) -> str:
+        return "https://api.github.com/repos/{}/{}/pulls?state=all&sort=updated&direction=desc&per_page=100&page={}".format(
+            config.repositoryOwner, config.repositoryName, page
+        )
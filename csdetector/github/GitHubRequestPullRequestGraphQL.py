@@ -0,0 +1,51 @@
+from datetime import datetime, timezone
+from dateutil.parser import isoparse
+from csdetector.entities.PullRequest import PullRequest
+from csdetector.github.GitHubRequestGraphQL import (
+    COMMENTS_SELECTION,
+    PAGE_SIZE,
+    PARTICIPANTS_SELECTION,
+    GitHubRequestGraphQL,
+)
+
+class GitHubRequestPullRequestGraphQL(GitHubRequestGraphQL):
+    @staticmethod
+    def query(orderBy: str = "CREATED_AT") -> str:
+        return """
+query($owner: String!, $name: String!, $cursor: String) {
+  repository(owner: $owner, name: $name) {
+    pullRequests(first: %(size)d, after: $cursor, orderBy: {field: %(orderBy)s, direction: DESC}) {
+      pageInfo { hasNextPage endCursor }
+      nodes {
+        number
+        createdAt
+        updatedAt
+        closedAt
+        commits { totalCount }
+        comments(first: %(size)d) { %(comments)s }
+        participants(first: %(size)d) { %(participants)s }
+      }
+    }
+  }
+}
+""" % dict(orderBy=orderBy, size=PAGE_SIZE, comments=COMMENTS_SELECTION, participants=PARTICIPANTS_SELECTION)
+
+    @staticmethod
+    def connection(data: dict) -> dict:
+        return data["repository"]["pullRequests"]
+
+    @staticmethod
+    def build(node: dict, comments: list, participants: list) -> PullRequest:
+        return PullRequest(
+            number=node["number"],
+            createdAt=isoparse(node["createdAt"]),
+            closedAt=(
+                datetime.now(timezone.utc)
+                if node["closedAt"] is None
+                else isoparse(node["closedAt"])
+            ),
+            comments=comments,
+            commitCount=node["commits"]["totalCount"],
+            participants=participants,
+            isOpen=node["closedAt"] is None,
+        )
@@ -0,0 +1,61 @@
+import hashlib
+import json
+import os
+import threading
+from urllib.parse import parse_qsl, urlencode, urlsplit
+
+GITHUB_API_URL = "https://api.github.com"
+
+# headers written to fixtures, enough to replay pagination and rate limits
+RECORDED_HEADERS = [
+    "Content-Type",
+    "ETag",
+    "Last-Modified",
+    "Link",
+    "Retry-After",
+    "X-RateLimit-Limit",
+    "X-RateLimit-Remaining",
+    "X-RateLimit-Reset",
+    "X-RateLimit-Resource",
+]
+
+# writes every GitHub API response to a fixture file so a run can later be
+# replayed offline by the GitHubMockServer
+class GitHubRequestRecorder:
+    def __init__(self, fixturesPath: str) -> None:
+        self._path = fixturesPath
+        self._lock = threading.Lock()
+        os.makedirs(self._path, exist_ok=True)
+
+    def record(self, method: str, url: str, payload: dict, response) -> None:
+        fixture = {
+            "method": method,
+            "url": url,
+            "payload": payload,
+            "status": response.status_code,
+            "headers": {
+                name: response.headers[name]
+                for name in RECORDED_HEADERS
+                if response.headers.get(name) is not None
+            },
+            "body": response.text,
+        }
+
+        path = os.path.join(self._path, "{}.json".format(self.fixtureKey(method, url, payload)))
+        with self._lock:
+            with open(path, "w") as f:
+                json.dump(fixture, f)
+
+    # fixtures are keyed by the api.github.com path, sorted query and payload
+    # so the same request matches no matter which host or parameter order is used
+    @staticmethod
+    def fixtureKey(method: str, url: str, payload: dict = None) -> str:
+        parts = urlsplit(url)
+        query = urlencode(sorted(parse_qsl(parts.query)))
+        key = "{} {}?{} {}".format(
+            method.upper(),
+            parts.path,
+            query,
+            json.dumps(payload, sort_keys=True) if payload is not None else "",
+        )
+        return hashlib.sha1(key.encode("utf-8")).hexdigest()
@@ -14,3 +14,6 @@ class GitHubRequestReleases(GitHubRequestStrategy):
     def urlRequestComments(config: Configuration, number: int):
         pass
 
+    @staticmethod
+    def urlRequestUpdatedPerPage(config: Configuration, page: int, since: str):
+        pass
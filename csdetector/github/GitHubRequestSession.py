@@ -0,0 +1,49 @@
+import logging
+import requests
+from requests.adapters import HTTPAdapter
+
+# persistent, keep-alive client bound to a single token
+# requests are served by a connection pool so only the first calls to a host
+# pay for the TCP and TLS handshakes
+class GitHubRequestSession:
+    def __init__(self, token: str, poolSize: int, http2: bool = False) -> None:
+        self._token = token
+        self._client = None
+
+        headers = {'Authorization': 'token ' + token}
+
+        if http2:
+            try:
+                import httpx
+
+                self._client = httpx.Client(
+                    http2=True,
+                    headers=headers,
+                    follow_redirects=True,
+                    limits=httpx.Limits(
+                        max_connections=poolSize,
+                        max_keepalive_connections=poolSize,
+                    ),
+                )
+            except ImportError:
+                logging.warning("HTTP/2 requires 'httpx[http2]', falling back to HTTP/1.1 sessions")
+
+        if self._client is None:
+            adapter = HTTPAdapter(pool_connections=2, pool_maxsize=poolSize)
+            self._client = requests.Session()
+            self._client.headers.update(headers)
+            self._client.mount("https://", adapter)
+            self._client.mount("http://", adapter)
+
+    @property
+    def token(self) -> str:
+        return self._token
+
+    def get(self, url: str, headers: dict = None):
+        return self._client.get(url, headers=headers)
+
+    def post(self, url: str, json: dict):
+        return self._client.post(url, json=json)
+
+    def close(self):
+        self._client.close()
@@ -18,3 +18,8 @@ class GitHubRequestStrategy(ABC):
     @abstractmethod
     def urlRequestComments(config: Configuration, number: int) -> str:
         pass
+
+    @staticmethod
+    @abstractmethod
+    def urlRequestUpdatedPerPage(config: Configuration, page: int, since: str) -> str:
+        pass
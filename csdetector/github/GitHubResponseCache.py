@@ -0,0 +1,141 @@
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+import requests
+from requests.structures import CaseInsensitiveDict
+
+# headers kept with a cached body so the rebuilt response still paginates
+STORED_HEADERS = ["Content-Type", "ETag", "Last-Modified", "Link"]
+
+# bumped whenever the responses table changes, older tables are dropped
+SCHEMA_VERSION = 1
+
+# the statistics are also logged every this many lookups, not only on close
+LOG_INTERVAL = 1000
+
+class CachedResponse:
+    def __init__(self, url: str, etag: str, lastModified: str, headers: dict, body: bytes) -> None:
+        self.url = url
+        self.etag = etag
+        self.lastModified = lastModified
+        self.headers = headers
+        self.body = body
+
+    def conditionalHeaders(self) -> dict:
+        headers = {}
+        if self.etag is not None:
+            headers["If-None-Match"] = self.etag
+        if self.lastModified is not None:
+            headers["If-Modified-Since"] = self.lastModified
+        return headers
+
+    def toResponse(self) -> requests.Response:
+        response = requests.Response()
+        response.url = self.url
+        response.status_code = 200
+        response.headers = CaseInsensitiveDict(self.headers)
+        response._content = self.body
+        response.encoding = "utf-8"
+        return response
+
+# persistent store of GitHub API responses used for conditional requests
+# GitHub answers If-None-Match/If-Modified-Since with a 304 that does not
+# count against the rate limit, so unchanged resources are served from disk
+# GitHub varies ETags by token, responses are keyed by URL and a fingerprint
+# of the token that fetched them, tokens themselves are never stored
+class GitHubResponseCache:
+    def __init__(self, path: str) -> None:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+
+        if self._connection.execute("PRAGMA user_version").fetchone()[0] != SCHEMA_VERSION:
+            self._connection.execute("DROP TABLE IF EXISTS responses")
+            self._connection.execute("PRAGMA user_version = {}".format(SCHEMA_VERSION))
+
+        self._connection.execute(
+            """CREATE TABLE IF NOT EXISTS responses (
+                url TEXT,
+                token TEXT,
+                etag TEXT,
+                last_modified TEXT,
+                headers TEXT,
+                body BLOB,
+                fetched_at REAL,
+                PRIMARY KEY (url, token)
+            )"""
+        )
+        self._connection.commit()
+
+        self.hits = 0
+        self.misses = 0
+
+    def lookup(self, url: str, token: str):
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT etag, last_modified, headers, body FROM responses WHERE url = ? AND token = ?",
+                (url, self._fingerprint(token)),
+            ).fetchone()
+
+        if row is None:
+            return None
+
+        return CachedResponse(url, row[0], row[1], json.loads(row[2]), row[3])
+
+    def store(self, url: str, token: str, response) -> None:
+        etag = response.headers.get("ETag")
+        lastModified = response.headers.get("Last-Modified")
+
+        # nothing to validate against on the next run
+        if etag is None and lastModified is None:
+            return
+
+        headers = {
+            name: response.headers[name]
+            for name in STORED_HEADERS
+            if response.headers.get(name) is not None
+        }
+
+        with self._lock:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (url, self._fingerprint(token), etag, lastModified, json.dumps(headers), response.content, time.time()),
+            )
+            self._connection.commit()
+
+    def hit(self) -> None:
+        with self._lock:
+            self.hits += 1
+            lookups = self.hits + self.misses
+
+        # a run that crashes still reports the cache use so far
+        if lookups % LOG_INTERVAL == 0:
+            self.logStatistics()
+
+    def miss(self) -> None:
+        with self._lock:
+            self.misses += 1
+            lookups = self.hits + self.misses
+
+        if lookups % LOG_INTERVAL == 0:
+            self.logStatistics()
+
+    def logStatistics(self) -> None:
+        total = self.hits + self.misses
+        ratio = 0 if total == 0 else self.hits / total * 100
+        logging.info(
+            "GitHub response cache: {} hits, {} misses ({:.1f}% hit rate)".format(self.hits, self.misses, ratio)
+        )
+
+    @staticmethod
+    def _fingerprint(token: str) -> str:
+        return hashlib.sha256(token.encode("utf-8")).hexdigest()[:16]
+
+    def close(self) -> None:
+        with self._lock:
+            self._connection.close()
@@ -4,7 +4,7 @@ from csdetector.github.GitHubRequestStrategy import GitHubRequestStrategy
 class GitHubRequestCommits(GitHubRequestStrategy):
     @staticmethod
     def urlNumberOfPages(config: Configuration) -> str:
-        return "https://api.github.com/repos/{}/{}/commits?page{0}&per_page=100".format(config.repositoryOwner, config.repositoryName)
+        return "https://api.github.com/repos/{}/{}/commits?page=1&per_page=100".format(config.repositoryOwner, config.repositoryName)
 
     @staticmethod
     def urlRequestPerPage(config: Configuration, page: int) -> str:
@@ -17,3 +17,7 @@ class GitHubRequestCommits(GitHubRequestStrategy):
     @staticmethod
     def urlRequestComments(config: Configuration, sha: str):
        return "" 
+
+    @staticmethod
+    def urlRequestUpdatedPerPage(config: Configuration, page: int, since: str):
+        return ""
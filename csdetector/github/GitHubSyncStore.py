@@ -0,0 +1,58 @@
+import json
+import logging
+import os
+from datetime import datetime
+from typing import Callable, List
+from dateutil.parser import isoparse
+
+from csdetector import Configuration
+
+# local copy of the PRs or issues of a repository used by incremental runs
+# the watermark is the time the last complete crawl started, the next crawl only asks
+# GitHub for items updated after it and merges them into the stored set
+class GitHubSyncStore:
+    def __init__(self, config: Configuration, kind: str, fromDict: Callable[[dict], object]) -> None:
+        self._path = os.path.join(config.repositoryPath, "sync", "{}.json".format(kind))
+        self._kind = kind
+        self._watermark = None
+        self._items = {}
+
+        if os.path.exists(self._path):
+            with open(self._path) as f:
+                stored = json.load(f)
+
+            self._watermark = isoparse(stored["watermark"])
+            self._items = {data["number"]: fromDict(data) for data in stored["items"]}
+            logging.info("Loaded {} stored {} synchronized at {}".format(len(self._items), kind, self._watermark))
+
+    @property
+    def watermark(self) -> datetime:
+        return self._watermark
+
+    @property
+    def items(self) -> List:
+        # same order as the GitHub listings, newest first
+        return sorted(self._items.values(), key=lambda item: item.createdAt, reverse=True)
+
+    def merge(self, items: List) -> None:
+        for item in items:
+            self._items[item.number] = item
+
+        logging.info("Merged {} updated {} into the local store".format(len(items), self._kind))
+
+    def save(self, watermark: datetime) -> None:
+        os.makedirs(os.path.dirname(self._path), exist_ok=True)
+
+        # write then rename so an interrupted run keeps the previous store
+        temporaryPath = self._path + ".tmp"
+        with open(temporaryPath, "w") as f:
+            json.dump(
+                {
+                    "watermark": watermark.isoformat(),
+                    "items": [item.toDict() for item in self._items.values()],
+                },
+                f,
+            )
+        os.replace(temporaryPath, self._path)
+
+        self._watermark = watermark
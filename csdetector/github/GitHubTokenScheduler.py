@@ -0,0 +1,115 @@
+import logging
+import threading
+import time
+from typing import Dict, List
+
+# budget assumed for a token until GitHub reports its real rate limit
+DEFAULT_BUDGET = 5000
+
+CORE_RESOURCE = "core"
+GRAPHQL_RESOURCE = "graphql"
+
+# rate limit budget of one token for one GitHub resource, GitHub counts the
+# REST ("core") and GraphQL ("graphql") requests of a token separately
+class RateLimitBudget:
+    def __init__(self) -> None:
+        self.remaining = DEFAULT_BUDGET
+        self.reset = 0.0
+
+class TokenState:
+    def __init__(self, index: int, token: str) -> None:
+        self.index = index
+        self.token = token
+        self.budgets: Dict[str, RateLimitBudget] = {}
+        self.pausedUntil = 0.0
+        self.invalid = False
+
+    def budget(self, resource: str) -> RateLimitBudget:
+        return self.budgets.setdefault(resource, RateLimitBudget())
+
+    def availableAt(self, resource: str) -> float:
+        # a token is usable again once its pause is over and, if the budget of
+        # the resource is exhausted, once that budget is reset
+        budget = self.budget(resource)
+        if budget.remaining > 0:
+            return self.pausedUntil
+
+        return max(self.pausedUntil, budget.reset)
+
+# picks the token with the most rate limit budget left for each request
+# budgets are kept per token and resource from the X-RateLimit-* headers of
+# every response, invalid tokens are removed and exhausted or throttled tokens
+# are only set aside until GitHub allows them again, secondary rate limits
+# pause a token for every resource
+class GitHubTokenScheduler:
+    def __init__(self, tokens: List[str]) -> None:
+        self._states = [TokenState(idx, token) for idx, token in enumerate(tokens)]
+        self._lock = threading.Lock()
+
+    def acquire(self, resource: str = CORE_RESOURCE) -> str:
+        while True:
+            with self._lock:
+                valid = [state for state in self._states if not state.invalid]
+
+                if len(valid) == 0:
+                    logging.error("No tokens available for GitHub API requests")
+                    raise Exception("No tokens available for GitHub API requests")
+
+                now = time.time()
+                available = [state for state in valid if state.availableAt(resource) <= now]
+
+                if len(available) > 0:
+                    state = max(available, key=lambda s: s.budget(resource).remaining)
+
+                    # reserve the request so concurrent callers spread across tokens
+                    budget = state.budget(resource)
+                    if budget.remaining > 0:
+                        budget.remaining -= 1
+                    return state.token
+
+                wakeUp = min(state.availableAt(resource) for state in valid)
+
+            sleepTime = max(wakeUp - time.time(), 0) + 1
+            logging.info("All tokens are rate limited for {}, sleeping {:.0f} seconds".format(resource, sleepTime))
+            time.sleep(sleepTime)
+
+    def update(self, token: str, resource: str, headers) -> None:
+        remaining = headers.get("X-RateLimit-Remaining")
+        reset = headers.get("X-RateLimit-Reset")
+
+        # the answer names the budget it was charged to
+        resource = headers.get("X-RateLimit-Resource") or resource
+
+        with self._lock:
+            budget = self._find(token).budget(resource)
+            try:
+                if remaining is not None:
+                    budget.remaining = int(remaining)
+                if reset is not None:
+                    budget.reset = float(reset)
+            except ValueError:
+                pass
+
+    def exhaust(self, token: str, resource: str, reset: float) -> None:
+        with self._lock:
+            state = self._find(token)
+            budget = state.budget(resource)
+            budget.remaining = 0
+            budget.reset = max(budget.reset, reset)
+            logging.warning("Token {} exhausted its {} rate limit until {}".format(state.index, resource, time.ctime(budget.reset)))
+
+    def pause(self, token: str, seconds: float) -> None:
+        with self._lock:
+            state = self._find(token)
+            state.pausedUntil = max(state.pausedUntil, time.time() + seconds)
+            logging.warning("Token {} hit a secondary rate limit, pausing it for {:.0f} seconds".format(state.index, seconds))
+
+    def invalidate(self, token: str) -> None:
+        with self._lock:
+            state = self._find(token)
+            if not state.invalid:
+                state.invalid = True
+                logging.warning("Token {} is invalid and will not be used anymore".format(state.index))
+
+    def _find(self, token: str) -> TokenState:
+        return next(state for state in self._states if state.token == token)
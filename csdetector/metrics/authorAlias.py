@@ -1,14 +1,14 @@
 import logging
 import yaml
+from contextlib import closing
 import os
 import re
-from git.repo import Repo
 from strsimpy.metric_lcs import MetricLCS
 
 from csdetector import Configuration
+from csdetector.entities.CommitIndex import CommitIndex
 from csdetector.github.GitHubRequestController import GitHubRequestController
 from csdetector.github.GitHubResquestCommits import GitHubRequestCommits
-from csdetector.github.GitHubRequestHelper import GitHubRequestHelper 
 
 # TODO: add output to file
 # TODO: filter out emails that belong to bot accounts
@@ -16,9 +16,9 @@ class AuthorAlias:
     _request: GitHubRequestController
     _aliases: dict
 
-    def __init__(self, config: Configuration, repo: Repo, request: GitHubRequestController) -> None:
+    def __init__(self, config: Configuration, index: CommitIndex, request: GitHubRequestController) -> None:
         self._config = config
-        self._repo = repo
+        self._index = index
         self._request = request
         self._request.setStrategy(strategy=GitHubRequestCommits)
         self._aliases = dict()
@@ -42,15 +42,9 @@ class AuthorAlias:
         return distance <= maxDistance
 
     def extract(self):
-        commits = list(self._repo.iter_commits())
-
-        emails = []
-
-        for commit in commits:
-            emails.append(GitHubRequestHelper.get_author_id(commit.author))
-
-        logging.info("Extracting author aliases from {} commits and {} emails".format(len(commits), len(emails)))
-        commitshaByEmail = self._exctrachCommitsByEmails(emails)
+        logging.info("Extracting author aliases from {} commits and {} emails".format(
+            len(self._index.commits), len(self._index.emails)))
+        commitshaByEmail = self._index.shaByEmail
 
         (loginByEmail, emailsWithoutLogins) = self._requestGithubAndRetrieveLogins(commitshaByEmail)
             
@@ -120,7 +114,7 @@ class AuthorAlias:
         return aliases
 
     def replaceAliases(self):
-        commits = list(self._repo.iter_commits())
+        commits = self._index.commits
         
         if self._aliases is None:
             return commits
@@ -135,60 +129,58 @@ class AuthorAlias:
                     transposesAliases[email] = alias
 
             # replace all author aliases with a unique one
-            return self._replaceAll(commits, transposesAliases)
+            return commits.withAliases(transposesAliases)
 
         except NameError as e:
             return commits
 
-    def _replaceAll(self, commits, aliases):
-        for commit in commits:
-            copy = commit
-            author = GitHubRequestHelper.get_author_id(commit.author)
-
-            if author in aliases:
-                copy.author.email = aliases[author]
-
-            yield copy
-
     def _requestGithubAndRetrieveLogins(self, commitshaByEmail):
         loginByEmail = {}
         emailsWithoutLogins = []
+        pending = set(commitshaByEmail)
 
-        for commit in commitshaByEmail:
-            sha = commitshaByEmail[commit]
-            #TODO: refactor this crapy code, sorry... I just want to finish this
-            commitUrl = GitHubRequestCommits.urlCommitBySha(self._config, sha)
-            response = self._request.request.request(commitUrl)
+        # each page of the commit listing resolves up to 100 commits at once, keep
+        # reading it while that is cheaper than looking up the remaining emails one by one
+        listedCommits = 0
+        with closing(self._request.requestCommitListing(self._config)) as listing:
+            for commit in listing:
+                listedCommits += 1
+                email = self._listedEmail(commit)
 
-            if response is None:
-                continue
+                if email in pending:
+                    pending.discard(email)
+                    self._assignLogin(email, commit, loginByEmail, emailsWithoutLogins)
+
+                if len(pending) == 0 or listedCommits / 100 >= len(pending):
+                    break
 
-            commit = response.json()
+        logging.info("Resolved {} emails from {} listed commits, {} left".format(
+            len(commitshaByEmail) - len(pending), listedCommits, len(pending)))
 
-            email = commit['commit']['author']['email']
+        # commits not found in the listing (e.g. outside the default branch)
+        leftover = list(pending)
+        responses = self._request.requestConcurrently(
+            [GitHubRequestCommits.urlCommitBySha(self._config, commitshaByEmail[email]) for email in leftover]
+        )
 
-            if commit['author'] is None:
-                emailsWithoutLogins.append(email)
+        for email, response in zip(leftover, responses):
+            if response is None:
                 continue
 
-            if commit['author']['login'] is not None:
-                loginByEmail[email] = commit['author']['login']
-            else:
-                emailsWithoutLogins.append(email)
+            self._assignLogin(email, response.json(), loginByEmail, emailsWithoutLogins)
             
         return (loginByEmail, emailsWithoutLogins)
 
-    def _exctrachCommitsByEmails(self, emails):
-        commitshaByEmail = {}
-
-        for email in emails:
-            commit = next(
-                commit
-                for commit in self._repo.iter_commits()
-                if GitHubRequestHelper.get_author_id(commit.author) == email
-            )
-
-            commitshaByEmail[email] = commit.hexsha
-
-        return commitshaByEmail
-
+    @staticmethod
+    def _listedEmail(commit):
+        email = commit['commit']['author']['email']
+        if email is None:
+            return None
+        return email.lower().strip()
+
+    @staticmethod
+    def _assignLogin(email, commit, loginByEmail, emailsWithoutLogins):
+        if commit['author'] is None or commit['author'].get('login') is None:
+            emailsWithoutLogins.append(email)
+        else:
+            loginByEmail[email] = commit['author']['login']
@@ -1,20 +1,23 @@
 import csv
 import logging
 import os
+import random
+import time
 from datetime import datetime
 from typing import List
 from collections import Counter
 from dateutil.relativedelta import relativedelta
 import networkx as nx
-from git import Commit
+import numpy as np
+from scipy import sparse
 import matplotlib.pyplot as plt
 from csdetector import Configuration
-from csdetector.github.GitHubRequestHelper import GitHubRequestHelper
+from csdetector.entities.CommitTable import CommitTable
 from csdetector.utils.statistics import outputStatistics
 from networkx.algorithms.community import greedy_modularity_communities
 
 class CentralityAnalysis:
-    def __init__(self, config: Configuration, commits: List[Commit], delta: relativedelta, batchDates: List[datetime]):
+    def __init__(self, config: Configuration, commits: CommitTable, delta: relativedelta, batchDates: List[datetime]):
         self._config = config
         self._commits = commits
         self._delta = delta
@@ -28,7 +31,7 @@ class CentralityAnalysis:
         for idx, batchStartDate in enumerate(self._batchDates):
             logging.info("Batch {} with start date {}".format(idx, batchStartDate))
             batchEndDate = batchStartDate + self._delta
-            batch = [c for c in self._commits if c.committed_datetime >= batchStartDate and c.committed_datetime < batchEndDate]
+            batch = self._commits.between(batchStartDate, batchEndDate)
             logging.info("Processing batch {} with {} commits".format(idx, len(batch)))
 
             batchCoreDevs = self._processBatch(idx, batch)
@@ -39,68 +42,133 @@ class CentralityAnalysis:
         return coreDevs
 
     def buildGraph(self, batchIdx: int, batch: list, prefix: str):
-        allRelatedAuthors = {}
-        authorItems = Counter({})
-
-        # for all commits...
         print("Analyzing centrality")
-        for authors in batch:
-
-            for author in authors:
-
-                # increase author commit count
-                authorItems.update({author: 1})
-
-                # get current related authors collection and update it
-                relatedAuthors = set(
-                    relatedAuthor
-                    for otherAuthors in batch
-                    for relatedAuthor in otherAuthors
-                    if author in otherAuthors and relatedAuthor != author
-                )
-                authorRelatedAuthors = allRelatedAuthors.setdefault(author, set())
-                authorRelatedAuthors.update(relatedAuthors)
-
-        return self._prepareGraph(allRelatedAuthors, authorItems, batchIdx, prefix)
-
-    def _processBatch(self, batchIdx: int, commits: List[Commit]):
-        allRelatedAuthors = {}
-        authorCommits = Counter({})
-
-        for commit in commits:
-            author = GitHubRequestHelper.get_author_id(commit.author)
-
-            authorCommits.update({ author: 1 })
-
-            commitDate = datetime.fromtimestamp(commit.committed_date)
-            earliestDate = commitDate + relativedelta(months=-1)
-            latestDate = commitDate + relativedelta(months=+1)
+        G, authorItems = self.participationGraph(batch)
+        return self._prepareGraph(G, authorItems, batchIdx, prefix)
+
+    # graph of the authors sharing at least one item (PR or issue) and the item
+    # count of every author, in order of appearance
+    # the edges are the nonzero entries above the diagonal of the author x author
+    # projection of the sparse item x author incidence matrix
+    @staticmethod
+    def participationGraph(batch: list):
+        authorItems = Counter(author for authors in batch for author in authors)
+        authors = list(authorItems)
+        authorIds = {author: idx for idx, author in enumerate(authors)}
+
+        rows = [itemIdx for itemIdx, itemAuthors in enumerate(batch) for _ in itemAuthors]
+        columns = [authorIds[author] for itemAuthors in batch for author in itemAuthors]
+        incidence = sparse.csr_matrix(
+            (np.ones(len(rows), dtype=np.int32), (rows, columns)),
+            shape=(len(batch), len(authors)),
+        )
 
-            commitRelatedCommits = filter(
-                lambda c: self._findRelatedCommits(author, earliestDate, latestDate, c), commits
-            )
+        projection = sparse.triu(incidence.T @ incidence, k=1).tocoo()
 
-            commitRelatedAuthors = set(
-                list(map(lambda c: GitHubRequestHelper.get_author_id(c.author), commitRelatedCommits))
-            )
-
-            # get current related authors collection and update it
-            authorRelatedAuthors = allRelatedAuthors.setdefault(author, set())
-            authorRelatedAuthors.update(commitRelatedAuthors)
-        return self._prepareGraph(allRelatedAuthors, authorCommits, batchIdx, "commitCentrality")
+        G = nx.Graph()
+        G.add_nodes_from(authors)
+        G.add_edges_from(
+            (authors[first].strip(), authors[second].strip())
+            for first, second in zip(projection.row.tolist(), projection.col.tolist())
+        )
 
-    def _prepareGraph(self,allRelatedAuthors: dict, authorItems: Counter, batchIdx: int, outputPrefix: str):
+        return G, authorItems
+
+    def _processBatch(self, batchIdx: int, commits: CommitTable):
+        allRelatedAuthors, authorCommits = self.relatedAuthors(commits)
+        return self._prepareGraph(self._relatedAuthorsGraph(allRelatedAuthors), authorCommits, batchIdx, "commitCentrality")
+
+    # authors of other commits made up to a month before or after each commit of
+    # an author, and the commit count of every author, in order of appearance
+    # the commits are swept in date order with a window [earliest, latest] that
+    # keeps the count of commits of every author in it, so each commit enters and
+    # leaves the window about once instead of every pair of commits being compared
+    @staticmethod
+    def relatedAuthors(commits: CommitTable):
+        authorIds = commits.authorIds.tolist()
+
+        # naive local dates, as datetime.fromtimestamp, and their ±1 month bounds
+        dates = localDates(commits.committedTs)
+        order = np.argsort(dates, kind="stable")
+        dates = dates[order]
+        earliest = np.searchsorted(dates, shiftMonths(dates, -1), side="left").tolist()
+        latest = np.searchsorted(dates, shiftMonths(dates, +1), side="right").tolist()
+        sortedIds = commits.authorIds[order].tolist()
+
+        windowCounts = Counter()
+        windowVersion = 0
+        mergedVersion = {}
+        relatedIds = {authorId: set() for authorId in authorIds}
+        start = 0
+        end = 0
+
+        def enter(position: int):
+            nonlocal windowVersion
+            windowCounts[sortedIds[position]] += 1
+            if windowCounts[sortedIds[position]] == 1:
+                windowVersion += 1
+
+        def leave(position: int):
+            nonlocal windowVersion
+            windowCounts[sortedIds[position]] -= 1
+            if windowCounts[sortedIds[position]] == 0:
+                del windowCounts[sortedIds[position]]
+                windowVersion += 1
+
+        # clamping the day to shorter months can move a bound a few hours back
+        # ("Jan 31 09:00" -> "Feb 28 09:00" but "Jan 30 10:00" -> "Feb 28 10:00"),
+        # so both pointers step backwards too
+        for idx, authorId in enumerate(sortedIds):
+            while end < latest[idx]:
+                enter(end)
+                end += 1
+            while end > latest[idx]:
+                end -= 1
+                leave(end)
+            while start > earliest[idx]:
+                start -= 1
+                enter(start)
+            while start < earliest[idx]:
+                leave(start)
+                start += 1
+
+            # the authors in the window only change when one enters or leaves it
+            if mergedVersion.get(authorId) != windowVersion:
+                mergedVersion[authorId] = windowVersion
+                relatedIds[authorId].update(windowCounts)
+
+        authors = commits.authors
+        allRelatedAuthors = {
+            authors[authorId]: set(authors[relatedId] for relatedId in related if relatedId != authorId)
+            for authorId, related in relatedIds.items()
+        }
+        authorCommits = Counter(authors[authorId] for authorId in authorIds)
+
+        return allRelatedAuthors, authorCommits
+
+    @staticmethod
+    def _relatedAuthorsGraph(allRelatedAuthors: dict):
         G = nx.Graph()
-        logging.info("Preparing graph for batch {} with {} authors".format(batchIdx, len(allRelatedAuthors)))
         for author in allRelatedAuthors:
             G.add_node(author)
 
             for relatedAuthor in allRelatedAuthors[author]:
                 G.add_edge(author.strip(), relatedAuthor.strip())
 
-        # analyze graph
-        closeness = dict(nx.closeness_centrality(G))
-        betweenness = dict(nx.betweenness_centrality(G))
+        return G
+
+    def _prepareGraph(self, G: nx.Graph, authorItems: Counter, batchIdx: int, outputPrefix: str):
+        logging.info("Preparing graph for batch {} with {} authors".format(batchIdx, len(authorItems)))
+
+        # analyze graph, estimating the O(V*E) centralities from pivots on large graphs
+        if G.number_of_nodes() > self._config.centralityThreshold:
+            samples = min(self._config.centralitySamples, G.number_of_nodes())
+            logging.info("Approximating closeness and betweenness from {} pivots".format(samples))
+            closeness = approximateCloseness(G, samples, self._config.centralitySeed)
+            betweenness = dict(nx.betweenness_centrality(G, k=samples, seed=self._config.centralitySeed))
+        else:
+            closeness = dict(nx.closeness_centrality(G))
+            betweenness = dict(nx.betweenness_centrality(G))
         centrality = dict(nx.degree_centrality(G))
         density = nx.density(G)
         modularity = []
@@ -123,7 +191,7 @@ class CentralityAnalysis:
         numberHighCentralityAuthors = len(highCentralityAuthors)
 
         percentageHighCentralityAuthors = numberHighCentralityAuthors / len(
-            allRelatedAuthors
+            authorItems
         )
 
         # calculate TFN
@@ -253,12 +321,55 @@ class CentralityAnalysis:
         )
 
         return highCentralityAuthors
-    
-    def _findRelatedCommits(self, author, earliestDate, latestDate, commit):
-        isDifferentAuthor = author != GitHubRequestHelper.get_author_id(commit.author)
-        if not isDifferentAuthor:
-            return False
-
-        commitDate = datetime.fromtimestamp(commit.committed_date)
-        isInRange = commitDate >= earliestDate and commitDate <= latestDate
-        return isInRange
+
+
+# unix timestamps as naive local datetime64 seconds
+def localDates(timestamps: np.ndarray) -> np.ndarray:
+    offsets = [time.localtime(timestamp).tm_gmtoff for timestamp in timestamps.tolist()]
+    return (timestamps.astype(np.int64) + np.array(offsets, dtype=np.int64)).astype("datetime64[s]")
+
+
+# dates moved by whole months as relativedelta(months=months), the day is
+# clamped to the length of the target month and the time of day is kept
+def shiftMonths(dates: np.ndarray, months: int) -> np.ndarray:
+    days = dates.astype("datetime64[D]")
+    monthStarts = dates.astype("datetime64[M]")
+    dayOfMonth = (days - monthStarts.astype("datetime64[D]")).astype(np.int64)
+
+    targets = monthStarts + months
+    monthLengths = ((targets + 1).astype("datetime64[D]") - targets.astype("datetime64[D]")).astype(np.int64)
+
+    return targets.astype("datetime64[D]") + np.minimum(dayOfMonth, monthLengths - 1) + (dates - days)
+
+
+# closeness centrality as nx.closeness_centrality, with the distance total of
+# every node estimated from breadth first searches of k pivots of its connected
+# component (Eppstein and Wang), components of up to k nodes are exact
+def approximateCloseness(G: nx.Graph, k: int, seed: int) -> dict:
+    sampler = random.Random(seed)
+    nodeOrder = {node: idx for idx, node in enumerate(G)}
+    closeness = {}
+
+    for component in nx.connected_components(G):
+        # sampled in graph order, the set order changes between runs
+        nodes = sorted(component, key=nodeOrder.get)
+        reachable = len(nodes)
+        pivots = nodes if reachable <= k else sampler.sample(nodes, k)
+
+        distanceTotals = dict.fromkeys(nodes, 0)
+        for pivot in pivots:
+            for node, distance in nx.single_source_shortest_path_length(G, pivot).items():
+                distanceTotals[node] += distance
+
+        pivotSet = set(pivots)
+        for node in nodes:
+            # pivots other than the node stand for the other reachable nodes
+            otherPivots = len(pivots) - (1 if node in pivotSet else 0)
+            if otherPivots == 0 or len(G) == 1:
+                closeness[node] = 0.0
+                continue
+
+            totalDistance = distanceTotals[node] * (reachable - 1) / otherPivots
+            closeness[node] = (reachable - 1) / totalDistance * (reachable - 1) / (len(G) - 1)
+
+    return {node: closeness[node] for node in G}
@@ -1,19 +1,18 @@
 from datetime import datetime
 import logging
-from typing import List
 from dateutil.relativedelta import relativedelta
-from git import Commit
+import numpy as np
 from pandas.core.dtypes.dtypes import pytz
-from sentistrength import PySentiStr
 import csv
 import os
 
 from csdetector import Configuration
-from csdetector.github.GitHubRequestHelper import GitHubRequestHelper
+from csdetector.entities.CommitTable import CommitTable
+from csdetector.metrics.sentimentScorer import SentimentScorer
 from csdetector.utils.statistics import outputStatistics
 
 class CommitAnalysis():
-    def __init__(self, senti: PySentiStr, commits: List[Commit], delta: relativedelta, config: Configuration):
+    def __init__(self, senti: SentimentScorer, commits: CommitTable, delta: relativedelta, config: Configuration):
         self._senti = senti
         self._commits = commits
         self._delta = delta
@@ -22,49 +21,54 @@ class CommitAnalysis():
 
     def extract(self):
         # sort commits
-        commits = self._commits.copy()
-        commits.sort(key=lambda o: o.committed_datetime)
+        commits = self._commits.sortedByCommitDate()
+        committedTs = commits.committedTs
 
         # split commits into batches
-        batches = []
-        batch = []
-        startDate = None
+        first = 0
 
         if self._config.startDate is not None:
             startDate = datetime.strptime(self._config.startDate, "%Y-%m-%d")
             startDate = startDate.replace(tzinfo=pytz.UTC)
+            first = int(np.searchsorted(committedTs, startDate.timestamp(), side="left"))
 
-        batchStartDate = None
-        batchEndDate = None
+        batches = []
         batchDates = []
         logging.info("Delta {}".format(self._delta))
 
-        for commit in commits:
-            if startDate is not None and startDate > commit.committed_datetime:
-                continue
+        # every batch starts at its first commit and ends delta after it
+        while first < len(commits):
+            batchStartDate = commits.committedDatetime(first)
+            batchEndDate = batchStartDate + self._delta
+            last = int(np.searchsorted(committedTs, batchEndDate.timestamp(), side="right"))
 
-            if batchStartDate is None:
-                batchStartDate = commit.committed_datetime
-                batchEndDate = batchStartDate + self._delta
-                batchDates.append(batchStartDate)
-            elif commit.committed_datetime > batchEndDate:
-                batches.append(batch)
-                batch = []
-                batchStartDate = commit.committed_datetime
-                batchEndDate = batchStartDate + self._delta
-                batchDates.append(batchStartDate)
+            batchDates.append(batchStartDate)
+            batches.append(range(first, last))
+            first = last
 
+        if len(batches) == 0:
+            batches.append(range(0))
 
-            batch.append(commit)
+        # one sweep over the sorted commits fills the accumulators of every batch
+        batchInfos = [self._aggregate(commits, batch) for batch in batches]
 
-        batches.append(batch)
-        del batch, commits
+        # every commit message is scored once, the scores are split back per batch
+        commitMessages = [message for batchInfo in batchInfos for message in batchInfo["commitMessages"]]
+        sentimentScores = []
+
+        if len(commitMessages) > 0:
+            sentimentScores = self._senti.getSentiment(commitMessages)
 
         authorInfoDict = {}
         daysActive = list()
+        offset = 0
 
-        for idx, batch in enumerate(batches):
-            batchAuthorInfoDict, batchDaysActive = self._analysis(idx)
+        for idx, batchInfo in enumerate(batchInfos):
+            count = len(batchInfo["commitMessages"])
+            batchAuthorInfoDict, batchDaysActive = self._analysis(
+                idx, batchInfo, list(sentimentScores[offset:offset + count])
+            )
+            offset += count
 
             authorInfoDict.update(batchAuthorInfoDict)
             daysActive.append(batchDaysActive)
@@ -72,44 +76,35 @@ class CommitAnalysis():
             
         return batchDates, authorInfoDict, daysActive
 
-    def _analysis(self, idx: int):
+    # author, timezone and sponsorship accumulators of the commits in one batch
+    # walked newest first, like the commit history
+    def _aggregate(self, commits: CommitTable, batch: range):
         authorInfoDict = {}
         timezoneInfoDict = {}
-        experienceDays = 150
-
-        startDate = None
-
-        if self._config.startDate is not None:
-            startDate = datetime.strptime(self._config.startDate, "%Y-%m-%d")
-            startDate = startDate.replace(tzinfo=pytz.UTC)
-
-        commits = self._commits.copy()
-        commits.sort(key=lambda x: x.committed_datetime, reverse=True)
-
         commitMessages = []
         lastDate = None
         firstDate = None
         realCommitCount = 0
 
-        for commit in commits:
-            if startDate is not None and startDate > commit.committed_datetime:
-                continue
+        for i in reversed(batch):
+            committedDate = commits.committedDatetime(i)
 
             if lastDate is None:
-                lastDate = commit.committed_datetime
+                lastDate = committedDate
 
-            firstDate = commit.committed_datetime
+            firstDate = committedDate
             realCommitCount = realCommitCount + 1
 
-            author = GitHubRequestHelper.get_author_id(commit.author)
-            timezone = commit.author_tz_offset
-            time = commit.authored_datetime
+            author = commits.author(i)
+            timezone = int(commits.authoredTz[i])
+            time = commits.authoredDatetime(i)
+            message = commits.message(i)
 
             timezoneInfo = timezoneInfoDict.setdefault(timezone, dict(commitCount=0, authors=set()))
             timezoneInfo["authors"].add(author)
 
-            if commit.message and commit.message.strip():
-                commitMessages.append(commit.message)
+            if message and message.strip():
+                commitMessages.append(message)
 
             timezoneInfo["commitCount"] += 1
 
@@ -131,23 +126,34 @@ class CommitAnalysis():
             if time < authorInfo["earliestCommitDate"]:
                 authorInfo["earliestCommitDate"] = time
 
-            if not commit.author_tz_offset == 0 and time.hour >= 9 and time.hour <= 17:
+            if not timezone == 0 and time.hour >= 9 and time.hour <= 17:
                 authorInfo["sponsoredCommitCount"] += 1
 
-        # analyzing commit message sentiment
-        sentimentScores = []
-        commitMessagesSentimentsPositive = []
-        commitMessagesSentimentsNegative = []
+        return dict(
+            authorInfoDict=authorInfoDict,
+            timezoneInfoDict=timezoneInfoDict,
+            commitMessages=commitMessages,
+            firstDate=firstDate,
+            lastDate=lastDate,
+            realCommitCount=realCommitCount,
+        )
 
-        if len(commitMessages) > 0:
-            sentimentScores = self._senti.getSentiment(commitMessages)
-            commitMessagesSentimentsPositive = list(
-                result for result in filter(lambda value: value >=1, sentimentScores)
-            )
+    def _analysis(self, idx: int, batchInfo: dict, sentimentScores: list):
+        authorInfoDict = batchInfo["authorInfoDict"]
+        timezoneInfoDict = batchInfo["timezoneInfoDict"]
+        firstDate = batchInfo["firstDate"]
+        lastDate = batchInfo["lastDate"]
+        realCommitCount = batchInfo["realCommitCount"]
+        experienceDays = 150
 
-            commitMessagesSentimentsNegative = list(
-                result for result in filter(lambda v: v <= -1, sentimentScores)
-            )
+        # analyzing commit message sentiment
+        commitMessagesSentimentsPositive = list(
+            result for result in filter(lambda value: value >=1, sentimentScores)
+        )
+
+        commitMessagesSentimentsNegative = list(
+            result for result in filter(lambda v: v <= -1, sentimentScores)
+        )
 
         sponsoredAuthorCount = 0
         for login, author in authorInfoDict.items():
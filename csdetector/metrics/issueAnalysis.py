@@ -1,33 +1,31 @@
-from datetime import datetime, timezone
+from datetime import datetime
 import os
 import csv
 import logging
-import math
-import sys
-import threading
 from typing import List
 from dateutil.relativedelta import relativedelta
-from dateutil.parser import isoparse
-import sentistrength
 from csdetector import Configuration
+from csdetector.metrics.sentimentScorer import SentimentScorer
 from csdetector.entities.Issue import Issue
 from csdetector.github.GitHubRequestController import GitHubRequestController
 from csdetector.github.GitHubRequestIssues import GitHubRequestIssues
 from csdetector.metrics.centralityAnalysis import CentralityAnalysis
 from csdetector.utils.statistics import outputStatistics
 from csdetector.metrics.sentimentAnalysis import SentimentAnalysis
+from csdetector.metrics.sentimentCache import SentimentCache
 
 class IssueAnalysis:
     _request: GitHubRequestController
     _config: Configuration
 
-    def __init__(self, config: Configuration, request: GitHubRequestController) -> None:
+    def __init__(self, config: Configuration, request: GitHubRequestController, cache: SentimentCache = None) -> None:
         self._config = config
         self._request = request
+        self._cache = cache
         self._request.setStrategy(strategy=GitHubRequestIssues)
         pass
 
-    def extract(self, senti: sentistrength.PySentiStr, delta: relativedelta, batchDates: List[datetime], cA: CentralityAnalysis):
+    def extract(self, senti: SentimentScorer, delta: relativedelta, batchDates: List[datetime], cA: CentralityAnalysis):
         batches = self._issueRequest(delta, batchDates)
 
         batchParticipants = list()
@@ -44,70 +42,12 @@ class IssueAnalysis:
             )
             batchParticipants.append(participants)
 
-            allComments = list()
-            issuePositiveComments = list()
-            issueNegativeComments = list()
-            generallyNegative = list()
-
-            semaphore = threading.Semaphore(15)
-            threads = []
-            for issue in batch:
-                comments = list(
-                    comment for comment in issue.comments if comment and comment.strip()
-                )
-
-                # split comments that are longer than 20KB
-                splitComments = []
-                for comment in comments:
-
-                    # calc number of chunks
-                    byteChunks = math.ceil(sys.getsizeof(comment) / (20 * 1024))
-                    if byteChunks > 1:
-
-                        # calc desired max length of each chunk
-                        chunkLength = math.floor(len(comment) / byteChunks)
-
-                        # divide comment into chunks
-                        chunks = [
-                            comment[i * chunkLength : i * chunkLength + chunkLength]
-                            for i in range(0, byteChunks)
-                        ]
-
-                        # save chunks
-                        splitComments.extend(chunks)
-
-                    else:
-                        # append comment as-is
-                        splitComments.append(comment)
-
-                # re-assign comments after chunking
-                comments = splitComments
-
-                if len(comments) == 0:
-                    issuePositiveComments.append(0)
-                    issueNegativeComments.append(0)
-                    continue
-
-                allComments.extend(comments)
-
-                thread = threading.Thread(
-                    target=SentimentAnalysis.analyze,
-                    args=(
-                        senti,
-                        comments,
-                        issuePositiveComments,
-                        issueNegativeComments,
-                        generallyNegative,
-                        semaphore,
-                    ),
-                )
-                threads.append(thread)
-
-            for thread in threads:
-                thread.start()
-
-            for thread in threads:
-                thread.join()
+            # score every comment of the batch once
+            itemComments = [SentimentAnalysis.splitComments(issue.comments) for issue in batch]
+            commentSentiments, issuePositiveComments, issueNegativeComments, generallyNegative = SentimentAnalysis.analyze(
+                senti, itemComments
+            )
+            allComments = [comment for comments in itemComments for comment in comments]
 
             # save comments
             batchComments.append(allComments)
@@ -115,25 +55,15 @@ class IssueAnalysis:
             # get comment length stats
             commentLengths = [len(c) for c in allComments]
 
-            generallyNegativeRatio = len(generallyNegative) / issueCount
+            generallyNegativeRatio = generallyNegative / issueCount
 
             durations = [(issue.closedAt - issue.createdAt).days for issue in batch]
 
             # analyze comment issue sentiment
-            commentSentiments = []
-            commentSentimentsPositive = 0
-            commentSentimentsNegative = 0
-
-            if len(allComments) > 0:
-                commentSentiments = senti.getSentiment(allComments)
-                commentSentimentsPositive = sum(
-                    1 for _ in filter(lambda value: value >= 1, commentSentiments)
-                )
-                commentSentimentsNegative = sum(
-                    1 for _ in filter(lambda value: value <= -1, commentSentiments)
-                )
+            commentSentimentsPositive = sum(1 for value in commentSentiments if value >= 1)
+            commentSentimentsNegative = sum(1 for value in commentSentiments if value <= -1)
 
-            toxicityPercentage = SentimentAnalysis.getToxicityPercentage(self._config, allComments)
+            toxicityPercentage = SentimentAnalysis.getToxicityPercentage(self._config, allComments, self._cache)
 
             cA.buildGraph(batchIdx, participants, "Issues")
 
@@ -230,46 +160,22 @@ class IssueAnalysis:
         batchStartDate = None
         batchEndDate = None
 
-        pages = self._request.numberOfPages(self._config) 
-
-        for page in range(1, pages + 1):
-            logging.info("Querying page {}".format(page))
-            response = self._request.requestPerPage(self._config, page) 
-
-            if response is not None:
-                responseData = response.json()
-                for data in responseData:
-                    createdAt = isoparse(data["created_at"])
-                    closedAt = (
-                        datetime.now(timezone.utc)
-                        if data["closed_at"] is None
-                        else isoparse(data["closed_at"])
-                    )
-
-                    if batchEndDate == None or (
-                        createdAt > batchEndDate and len(batches) < len(batchDates) - 1
-                    ):
-
-                        if batch != None:
-                            batches.append(batch)
-
-                        batchStartDate = batchDates[len(batches)]
-                        batchEndDate = batchStartDate + delta
-
-                        batch = []
-
-                    comments = self._request.requestComments(data["comments_url"])
-                    participants = self._request.requestParticipants(self._config, data["number"])
-
-                    issue = Issue(
-                        number=data["number"],
-                        createdAt=createdAt,
-                        closedAt=closedAt,
-                        comments=comments,
-                        participants=participants,
-                    )
-                    
-                    batch.append(issue)
+        issues = self._request.requestIssues(self._config)
+
+        for issue in issues:
+            if batchEndDate == None or (
+                issue.createdAt > batchEndDate and len(batches) < len(batchDates) - 1
+            ):
+
+                if batch != None:
+                    batches.append(batch)
+
+                batchStartDate = batchDates[len(batches)]
+                batchEndDate = batchStartDate + delta
+
+                batch = []
+
+            batch.append(issue)
 
         if batch != None:
             batches.append(batch)
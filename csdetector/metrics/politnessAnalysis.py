@@ -3,6 +3,7 @@ import csv
 import convokit
 
 from csdetector import Configuration
+from csdetector.metrics.sentimentCache import SentimentCache
 from csdetector.utils.statistics import calculateStats
 
 class PolitnessAnalysis:
@@ -27,11 +28,11 @@ class PolitnessAnalysis:
                 w.writerow([f"ACCL", accl])
 
     @classmethod
-    def calculateRPC(cls, config, outputPrefix, commentBatches):
+    def calculateRPC(cls, config, outputPrefix, commentBatches, cache: SentimentCache = None):
         for batchIdx, batch in enumerate(commentBatches):
 
             # analyze batch
-            positiveMarkerCount = cls.getResults(batch)
+            positiveMarkerCount = cls.getResults(batch, cache)
 
             # output results
             with open(
@@ -42,8 +43,29 @@ class PolitnessAnalysis:
                 w = csv.writer(f, delimiter=",")
                 w.writerow([f"RPC{outputPrefix}", positiveMarkerCount])
     
+    @classmethod
+    def getResults(cls, comments: list, cache: SentimentCache = None):
+        if cache is None:
+            return sum(cls._positiveMarkers(comments))
+
+        # only parse the comments never analyzed before
+        markers = cache.lookup("politeness", comments)
+        pending = [idx for idx, marker in enumerate(markers) if marker is None]
+        pendingComments = [comments[idx] for idx in pending]
+
+        if len(pendingComments) > 0:
+            pendingMarkers = cls._positiveMarkers(pendingComments)
+            cache.store("politeness", pendingComments, pendingMarkers)
+
+            for idx, marker in zip(pending, pendingMarkers):
+                markers[idx] = marker
+
+        # get positive politeness marker count
+        return sum(markers)
+
+    # positive politeness marker count of every comment
     @staticmethod
-    def getResults(comments: list):
+    def _positiveMarkers(comments: list):
         # define default speaker
         speaker = convokit.Speaker(id="default", name="default")
 
@@ -65,14 +87,8 @@ class PolitnessAnalysis:
         # extract politeness features
         politeness = convokit.PolitenessStrategies()
         corpus = politeness.transform(corpus, markers=True)
-        features = corpus.get_utterances_dataframe()
-
-        # get positive politeness marker count
-        positiveMarkerCount = sum(
-            [
-                feature["feature_politeness_==HASPOSITIVE=="]
-                for feature in features["meta.politeness_strategies"]
-            ]
-        )
 
-        return positiveMarkerCount
+        return [
+            int(corpus.get_utterance(str(idx)).meta["politeness_strategies"]["feature_politeness_==HASPOSITIVE=="])
+            for idx in range(len(comments))
+        ]
@@ -1,80 +1,52 @@
 import csv
 import os
 import logging
-import math
-import sys
-import threading
-from datetime import datetime, timezone
+from datetime import datetime
 from typing import List
-from dateutil.parser import isoparse
 from dateutil.relativedelta import relativedelta
-import sentistrength
 from csdetector import Configuration
+from csdetector.metrics.sentimentScorer import SentimentScorer
 from csdetector.entities.PullRequest import PullRequest
 from csdetector.github.GitHubRequestController import GitHubRequestController
 from csdetector.github.GitHubRequestPullRequest import GitHubRequestPullRequest
 from csdetector.metrics.centralityAnalysis import CentralityAnalysis
 from csdetector.metrics.sentimentAnalysis import SentimentAnalysis
+from csdetector.metrics.sentimentCache import SentimentCache
 from csdetector.utils.statistics import outputStatistics
 
 class PRAnalysis:
     _request: GitHubRequestController
     _config: Configuration
 
-    def __init__(self, config: Configuration, request: GitHubRequestController) -> None:
+    def __init__(self, config: Configuration, request: GitHubRequestController, cache: SentimentCache = None) -> None:
         self._config = config
         self._request = request
+        self._cache = cache
         self._request.setStrategy(strategy=GitHubRequestPullRequest)
         pass
 
     def _prRequest(self, delta: relativedelta, batchDates: List[datetime]) -> List[List[PullRequest]]:
-        pages = self._request.numberOfPages(self._config) 
-        
+        pullRequests = self._request.requestPullRequests(self._config)
+
         # prepare batches
         batches = []
         batch = None
         batchStartDate = None
         batchEndDate = None
-        for page in range(1, pages + 1):
-            logging.info("Querying page {}".format(page))
-            response = self._request.requestPerPage(self._config, page) 
-
-            if response is not None:
-                responseData = response.json()
-                for data in responseData:
-                    createdAt = isoparse(data["created_at"])
-                    closedAt = (
-                        datetime.now(timezone.utc)
-                        if data["closed_at"] is None
-                        else isoparse(data["closed_at"])
-                    )
-
-                    if batchEndDate == None or (
-                        createdAt > batchEndDate and len(batches) < len(batchDates) - 1
-                    ):
-
-                        if batch != None:
-                            batches.append(batch)
-
-                        batchStartDate = batchDates[len(batches)]
-                        batchEndDate = batchStartDate + delta
-
-                        batch = []
-
-                    comments = self._request.requestComments(data["comments_url"])
-                    participants = self._request.requestParticipants(self._config, data["number"])
-                    commitCount = self._request.requestTotalCommits(data["commits_url"])
-
-                    pr = PullRequest(
-                        number=data["number"],
-                        createdAt=createdAt,
-                        closedAt=closedAt,
-                        comments=comments,
-                        commitCount=commitCount,
-                        participants=participants
-                    )
-
-                    batch.append(pr)
+        for pr in pullRequests:
+            if batchEndDate == None or (
+                pr.createdAt > batchEndDate and len(batches) < len(batchDates) - 1
+            ):
+
+                if batch != None:
+                    batches.append(batch)
+
+                batchStartDate = batchDates[len(batches)]
+                batchEndDate = batchStartDate + delta
+
+                batch = []
+
+            batch.append(pr)
 
         if batch != None:
             batches.append(batch)
@@ -82,7 +54,7 @@ class PRAnalysis:
         logging.info("Retrieved {} PRs".format(len(batches)))
         return batches
 
-    def extract(self, senti: sentistrength.PySentiStr, delta: relativedelta,batchDates: List[datetime], cA: CentralityAnalysis):
+    def extract(self, senti: SentimentScorer, delta: relativedelta,batchDates: List[datetime], cA: CentralityAnalysis):
 
         logging.info("Querying PRs")
         batches = self._prRequest(delta, batchDates)
@@ -100,73 +72,12 @@ class PRAnalysis:
             )
             batchParticipants.append(participants)
 
-            allComments = list()
-            prPositiveComments = list()
-            prNegativeComments = list()
-            generallyNegative = list()
-
-            semaphore = threading.Semaphore(15)
-            threads = []
-            for pr in batch:
-
-                comments = list(
-                    comment for comment in pr.comments if comment and comment.strip()
-                )
-
-                # split comments that are longer than 20KB
-                splitComments = []
-                for comment in comments:
-
-                    # calc number of chunks
-                    byteChunks = math.ceil(sys.getsizeof(comment) / (20 * 1024))
-                    if byteChunks > 1:
-
-                        # calc desired max length of each chunk
-                        chunkLength = math.floor(len(comment) / byteChunks)
-
-                        # divide comment into chunks
-                        chunks = [
-                            comment[i * chunkLength : i * chunkLength + chunkLength]
-                            for i in range(0, byteChunks)
-                        ]
-
-                        # save chunks
-                        splitComments.extend(chunks)
-
-                    else:
-                        # append comment as-is
-                        splitComments.append(comment)
-
-                # re-assign comments after chunking
-                comments = splitComments
-
-                if len(comments) == 0:
-                    prPositiveComments.append(0)
-                    prNegativeComments.append(0)
-                    continue
-
-                allComments.extend(comments)
-
-                thread = threading.Thread(
-                    target=SentimentAnalysis.analyze,
-                    args=(
-                        senti,
-                        comments,
-                        prPositiveComments,
-                        prNegativeComments,
-                        generallyNegative,
-                        semaphore,
-                    ),
-                )
-                threads.append(thread)
-
-            for thread in threads:
-                thread.start()
-
-            for thread in threads:
-                thread.join()
-
-            logging.info("")
+            # score every comment of the batch once
+            itemComments = [SentimentAnalysis.splitComments(pr.comments) for pr in batch]
+            commentSentiments, prPositiveComments, prNegativeComments, generallyNegative = SentimentAnalysis.analyze(
+                senti, itemComments
+            )
+            allComments = [comment for comments in itemComments for comment in comments]
 
             # save comments
             batchComments.append(allComments)
@@ -174,24 +85,14 @@ class PRAnalysis:
             # get comment length stats
             commentLengths = [len(c) for c in allComments]
 
-            generallyNegativeRatio = len(generallyNegative) / prCount
+            generallyNegativeRatio = generallyNegative / prCount
 
             # get pr duration stats
             durations = [(pr.closedAt - pr.createdAt).days for pr in batch]
-            commentSentiments = []
-            commentSentimentsPositive = 0
-            commentSentimentsNegative = 0
-
-            if len(allComments) > 0:
-                commentSentiments = senti.getSentiment(allComments)
-                commentSentimentsPositive = sum(
-                    1 for _ in filter(lambda value: value >= 1, commentSentiments)
-                )
-                commentSentimentsNegative = sum(
-                    1 for _ in filter(lambda value: value <= -1, commentSentiments)
-                )
-
-            toxicityPercentage = SentimentAnalysis.getToxicityPercentage(self._config, allComments)
+            commentSentimentsPositive = sum(1 for value in commentSentiments if value >= 1)
+            commentSentimentsNegative = sum(1 for value in commentSentiments if value <= -1)
+
+            toxicityPercentage = SentimentAnalysis.getToxicityPercentage(self._config, allComments, self._cache)
 
             cA.buildGraph(batchIdx, participants, "PRs")
 
@@ -5,9 +5,10 @@ from dateutil.parser import isoparse
 import logging
 from typing import List
 from dateutil.relativedelta import relativedelta
-from git import Commit
+import numpy as np
 
 from csdetector import Configuration
+from csdetector.entities.CommitTable import CommitTable
 from csdetector.entities.Release import Release
 from csdetector.github.GitHubRequestController import GitHubRequestController
 from csdetector.github.GitHubRequestReleases import GitHubRequestReleases
@@ -58,9 +59,13 @@ class ReleaseAnalysis:
 
         return batches
 
-    def extract(self, allCommits: List[Commit], delta: relativedelta, batchDates: List[datetime]):
+    def extract(self, allCommits: CommitTable, delta: relativedelta, batchDates: List[datetime]):
         # sort commits by ascending commit date
-        allCommits.sort(key=lambda c: c.committed_datetime)
+        allCommits = allCommits.sortedByCommitDate()
+        committedTs = allCommits.committedTs
+
+        # position of the first commit not counted by a release yet
+        first = 0
 
         logging.info("Querying releases")
         batches = self._releaseRequest(delta, batchDates)
@@ -72,39 +77,28 @@ class ReleaseAnalysis:
             releaseCommitsCount = {}
 
             for i, release in enumerate(releases):
-                releaseCommits = list()
-                releaseDate = release.createdAt
+                releaseDate = release.createdAt.timestamp()
 
                 # try add author to set
                 releaseAuthors.add(release.author)
 
-                if i == 0:
-
-                    # this is the first release, get all commits prior to release created date
-                    for commit in allCommits:
-                        if commit.committed_datetime < releaseDate:
-                            releaseCommits.append(commit)
-                        else:
-                            break
-
+                # this is the first release, get all commits prior to release created date
+                # otherwise get the in-between commit count, none if the next commit
+                # is older than the previous release
+                if i == 0 or (
+                    first < len(allCommits) and committedTs[first] >= releases[i - 1].createdAt.timestamp()
+                ):
+                    last = first + int(np.searchsorted(committedTs[first:], releaseDate, side="left"))
                 else:
+                    last = first
 
-                    # get in-between commit count
-                    prevReleaseDate = releases[i - 1].createdAt
-                    for commit in allCommits:
-                        if (
-                            commit.committed_datetime >= prevReleaseDate
-                            and commit.committed_datetime < releaseDate
-                        ):
-                            releaseCommits.append(commit)
-                        else:
-                            break
-
-                # remove all counted commits from list to improve iteration speed
-                allCommits = allCommits[len(releaseCommits) :]
+                releaseCommits = range(first, last)
 
                 # calculate authors per release
-                commitAuthors = set(commit.author.email for commit in releaseCommits)
+                commitAuthors = set(allCommits.authorIds[first:last].tolist())
+
+                # skip all counted commits on the next release
+                first = last
 
                 # add results
                 releaseCommitsCount[release.name] = dict(
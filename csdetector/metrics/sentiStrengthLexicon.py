@@ -0,0 +1,247 @@
+import math
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from typing import List
+
+from csdetector.metrics.sentimentCache import SentimentCache
+from csdetector.metrics.sentimentScorer import SentimentScorer
+
+# lists of the SentiStrength_Data folder read by the lexicon scorer, only the
+# emotion table is required
+EMOTION_TABLES = ["EmotionLookupTable.txt", "SentimentLookupTable.txt"]
+BOOSTER_LIST = "BoosterWordList.txt"
+NEGATING_LIST = "NegatingWordList.txt"
+EMOTICON_TABLE = "EmoticonLookupTable.txt"
+IDIOM_TABLE = "IdiomLookupTable.txt"
+
+# words before an emotion word searched for a negation
+NEGATION_WINDOW = 3
+
+# negated positive words become negative with this share of their strength above
+# neutral, rounded away from zero so "not good" is still negative, negated
+# negative words become neutral
+NEGATED_STRENGTH = 0.5
+
+# texts scored by a worker process at once, and fewer texts than this are
+# scored in the calling process as starting the workers would cost more
+CHUNK_SIZE = 2000
+
+WORD = re.compile(r"[a-z0-9']+|[.!?]")
+REPEATED_LETTERS = re.compile(r"([a-z])\1{2,}")
+
+# in-process SentiStrength scorer working on the SentiStrength_Data lists
+# without a JVM, following the default rules of the jar:
+#   - every sentence scores its strongest positive and negative term
+#   - boosters before a term and repeated letters or "!" after it add emphasis
+#   - a negation up to NEGATION_WINDOW words before a term flips or neutralises it
+#   - idioms override the terms they contain, emoticons count as a term
+#   - a text scores its strongest sentence, positive 1..5 and negative -1..-5
+# irony, slang and spelling correction of the jar are not applied, so scores
+# can differ from the jar, by how much has not been measured yet
+# with jobs > 1 the chunks of a text list are scored by as many worker
+# processes, each loading its own lists, and joined back in the input order
+class SentiStrengthLexicon(SentimentScorer):
+    kind = "sentistrength-python"
+
+    def __init__(self, dataPath: str, cache: SentimentCache = None, jobs: int = 1) -> None:
+        super().__init__(cache)
+        self._dataPath = dataPath
+        self._jobs = jobs
+        self._executor = None
+
+        # the emotion table was renamed in later SentiStrength versions
+        emotionTable = os.path.join(dataPath, EMOTION_TABLES[0])
+        for name in EMOTION_TABLES:
+            if os.path.exists(os.path.join(dataPath, name)):
+                emotionTable = os.path.join(dataPath, name)
+                break
+
+        self._emotions, self._emotionPrefixes = self._readTerms(emotionTable, required=True)
+        self._boosters, _ = self._readTerms(os.path.join(dataPath, BOOSTER_LIST))
+        negating, negatingPrefixes = self._readTerms(os.path.join(dataPath, NEGATING_LIST))
+        self._negating = set(negating)
+        self._negatingPrefixes = [prefix for prefix, value in negatingPrefixes]
+        self._emoticons, _ = self._readTerms(os.path.join(dataPath, EMOTICON_TABLE), lower=False)
+
+        # idioms indexed by their first word
+        self._idioms = {}
+        idioms, _ = self._readTerms(os.path.join(dataPath, IDIOM_TABLE))
+        for idiom, value in idioms.items():
+            words = tuple(WORD.findall(idiom))
+            if len(words) > 1:
+                self._idioms.setdefault(words[0], []).append((words, value))
+
+        # strength of every word seen, wildcard lookups are not repeated
+        self._strengths = {}
+
+    def scores(self, texts: List[str]) -> List[tuple]:
+        if self._jobs < 2 or len(texts) < CHUNK_SIZE:
+            return [self._score(text) for text in texts]
+
+        # workers are started on the first large list and kept for the run
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self._jobs, initializer=_startWorker, initargs=(self._dataPath,)
+            )
+
+        chunks = [texts[i : i + CHUNK_SIZE] for i in range(0, len(texts), CHUNK_SIZE)]
+        return [
+            result
+            for chunkResults in self._executor.map(_scoreChunk, chunks)
+            for result in chunkResults
+        ]
+
+    def close(self):
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    def _score(self, text: str) -> tuple:
+        # same input normalization as sentistrength.PySentiStr
+        text = text.replace("\n", "").replace("\r", "")
+
+        positive = 1
+        negative = -1
+        sentence = []
+        emphasized = []
+
+        for chunk in text.split():
+            value = self._emoticons.get(chunk)
+            if value is not None:
+                strength = value + 1 if value > 0 else value - 1 if value < 0 else 0
+                positive = max(positive, strength)
+                negative = min(negative, strength)
+                continue
+
+            for word in WORD.findall(chunk.lower()):
+                if word == "!" and len(emphasized) > 0:
+                    emphasized[-1] = True
+
+                if word in ".!?":
+                    positive, negative = self._scoreSentence(sentence, emphasized, positive, negative)
+                    sentence = []
+                    emphasized = []
+                else:
+                    sentence.append(word)
+                    emphasized.append(False)
+
+        positive, negative = self._scoreSentence(sentence, emphasized, positive, negative)
+
+        positive = min(5, max(1, positive))
+        negative = max(-5, min(-1, negative))
+        neutral = 1 if positive + negative > 0 else -1 if positive + negative < 0 else 0
+
+        return (positive, negative, neutral)
+
+    def _scoreSentence(self, words: List[str], emphasized: List[bool], positive: int, negative: int):
+        skip = 0
+
+        for i, word in enumerate(words):
+            if skip > 0:
+                skip -= 1
+                continue
+
+            strength = self._strength(word)
+
+            for idiom, value in self._idioms.get(word, []):
+                if tuple(words[i : i + len(idiom)]) == idiom:
+                    strength = value
+                    skip = len(idiom) - 1
+                    break
+
+            if strength == 0:
+                continue
+
+            sign = 1 if strength > 0 else -1
+
+            if i > 0 and words[i - 1] in self._boosters:
+                strength += sign * self._boosters[words[i - 1]]
+
+            if REPEATED_LETTERS.search(word) or emphasized[i]:
+                strength += sign
+
+            if any(self._isNegating(previous) for previous in words[max(0, i - NEGATION_WINDOW) : i]):
+                strength = -(1 + math.ceil((strength - 1) * NEGATED_STRENGTH)) if strength > 0 else 0
+
+            positive = max(positive, strength)
+            negative = min(negative, strength)
+
+        return positive, negative
+
+    def _strength(self, word: str) -> int:
+        strength = self._strengths.get(word)
+
+        if strength is None:
+            strength = self._lookup(word)
+
+            # "goooood" is looked up as "good", then as "god"
+            if strength == 0 and REPEATED_LETTERS.search(word):
+                strength = self._lookup(REPEATED_LETTERS.sub(r"\1\1", word)) or self._lookup(
+                    REPEATED_LETTERS.sub(r"\1", word)
+                )
+
+            self._strengths[word] = strength
+
+        return strength
+
+    def _lookup(self, word: str) -> int:
+        strength = self._emotions.get(word)
+        if strength is not None:
+            return strength
+
+        for prefix, value in self._emotionPrefixes:
+            if word.startswith(prefix):
+                return value
+
+        return 0
+
+    def _isNegating(self, word: str) -> bool:
+        return word in self._negating or any(word.startswith(prefix) for prefix in self._negatingPrefixes)
+
+    # "term<TAB>value" lines, terms ending with * match every word starting with
+    # them and are returned apart, longest first so the most specific one wins
+    @staticmethod
+    def _readTerms(path: str, lower: bool = True, required: bool = False):
+        terms = {}
+        prefixes = []
+
+        if not required and not os.path.exists(path):
+            return terms, prefixes
+
+        with open(path, encoding="utf-8", errors="ignore") as f:
+            for line in f:
+                fields = line.rstrip("\r\n").split("\t")
+                term = fields[0].strip()
+
+                if len(term) == 0 or term.startswith("//"):
+                    continue
+
+                if lower:
+                    term = term.lower()
+
+                try:
+                    value = int(float(fields[1])) if len(fields) > 1 and fields[1].strip() else 0
+                except ValueError:
+                    value = 0
+
+                if term.endswith("*"):
+                    prefixes.append((term[:-1], value))
+                else:
+                    terms[term] = value
+
+        prefixes.sort(key=lambda prefix: len(prefix[0]), reverse=True)
+        return terms, prefixes
+
+
+# lexicon of a worker process, loaded once by its initializer
+_workerLexicon = None
+
+
+def _startWorker(dataPath: str):
+    global _workerLexicon
+    _workerLexicon = SentiStrengthLexicon(dataPath)
+
+
+def _scoreChunk(texts: List[str]) -> List[tuple]:
+    return [_workerLexicon._score(text) for text in texts]
@@ -0,0 +1,112 @@
+import logging
+import queue
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+from typing import List
+
+from csdetector.metrics.sentimentCache import SentimentCache
+from csdetector.metrics.sentimentScorer import SentimentScorer
+
+# texts written to a process before reading its answers, small enough for the
+# answers to fit in the pipe buffer while the texts are still being written
+CHUNK_SIZE = 1000
+
+# attempts of a chunk on a fresh process when SentiStrength crashes
+MAX_RESTARTS = 2
+
+# one long-lived `java -jar SentiStrength.jar stdin` process, it answers every
+# text line on stdin with a "positive negative neutral" line on stdout
+class SentiStrengthProcess:
+    def __init__(self, jarPath: str, dataPath: str) -> None:
+        self._command = ["java", "-jar", jarPath, "stdin", "sentidata", dataPath, "trinary"]
+        self._process = None
+
+    def score(self, texts: List[str]) -> List[tuple]:
+        for attempt in range(MAX_RESTARTS + 1):
+            if self._process is None or self._process.poll() is not None:
+                self._start()
+
+            try:
+                return self._score(texts)
+            except (BrokenPipeError, EOFError, ValueError) as e:
+                logging.warning("SentiStrength process failed ({}), restarting it".format(e))
+                self.close()
+
+        raise Exception("SentiStrength failed {} times on the same texts".format(MAX_RESTARTS + 1))
+
+    def close(self):
+        if self._process is None:
+            return
+
+        try:
+            self._process.stdin.close()
+            self._process.wait(timeout=5)
+        except (OSError, subprocess.TimeoutExpired):
+            self._process.kill()
+
+        self._process = None
+
+    def _start(self):
+        self._process = subprocess.Popen(
+            self._command,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+        )
+
+    def _score(self, texts: List[str]) -> List[tuple]:
+        # same input normalization as sentistrength.PySentiStr
+        lines = "".join(
+            text.replace("\n", "").replace("\r", "").replace(" ", "+") + "\n" for text in texts
+        )
+        self._process.stdin.write(lines.encode("utf-8"))
+        self._process.stdin.flush()
+
+        scores = []
+        for _ in texts:
+            line = self._process.stdout.readline()
+            if len(line) == 0:
+                raise EOFError("SentiStrength exited")
+
+            positive, negative, neutral = (int(float(value)) for value in line.split()[:3])
+            scores.append((positive, negative, neutral))
+
+        return scores
+
+
+# pool of SentiStrength processes started once per run, replacing the JVM
+# launched by every sentistrength.PySentiStr.getSentiment call
+# texts are split in chunks scored concurrently by the idle processes
+class SentiStrengthPool(SentimentScorer):
+    kind = "sentistrength-java"
+
+    def __init__(self, jarPath: str, dataPath: str, size: int = 4, cache: SentimentCache = None) -> None:
+        super().__init__(cache)
+        self._processes = queue.Queue()
+        self._allProcesses = []
+        self._executor = ThreadPoolExecutor(max_workers=size)
+
+        for _ in range(size):
+            process = SentiStrengthProcess(jarPath, dataPath)
+            self._processes.put(process)
+            self._allProcesses.append(process)
+
+    def close(self):
+        self._executor.shutdown()
+        for process in self._allProcesses:
+            process.close()
+
+    def scores(self, texts: List[str]) -> List[tuple]:
+        chunks = [texts[i : i + CHUNK_SIZE] for i in range(0, len(texts), CHUNK_SIZE)]
+        return [
+            result
+            for chunkResults in self._executor.map(self._scoreChunk, chunks)
+            for result in chunkResults
+        ]
+
+    def _scoreChunk(self, texts: List[str]) -> List[tuple]:
+        process = self._processes.get()
+        try:
+            return process.score(texts)
+        finally:
+            self._processes.put(process)
@@ -4,71 +4,106 @@ from datetime import datetime
 import json
 import time
 import math
-import threading
+import sys
 from typing import List
-import sentistrength
 
 from csdetector import Configuration
+from csdetector.metrics.sentimentScorer import SentimentScorer
+from csdetector.metrics.sentimentCache import SentimentCache
 
 class SentimentAnalysis:
+    # scores every distinct comment of a batch in one call and derives the
+    # per-item positive and negative counts and the generally negative items
+    # from the same scores
     @staticmethod
-    def analyze(
-        senti: sentistrength.PySentiStr,
-        comments, 
-        positiveComments, 
-        negativeComments, 
-        generallyNegative, 
-        semaphore
-    ):
-        with semaphore:
-            commentSentiments = (
-                senti.getSentiment(comments, score="scale")
-                if len(comments) > 1
-                else senti.getSentiment(comments[0])
-            )
+    def analyze(senti: SentimentScorer, itemComments: List[List[str]]):
+        allComments = [comment for comments in itemComments for comment in comments]
+        uniqueComments = list(dict.fromkeys(allComments))
 
-            commentSentimentsPositive = sum(
-                1 for _ in filter(lambda value: value >= 1, commentSentiments)
-            )
-            commentSentimentsNegative = sum(
-                1 for _ in filter(lambda value: value <= -1, commentSentiments)
-            )
+        scoreByComment = {}
+        if len(uniqueComments) > 0:
+            scoreByComment = dict(zip(uniqueComments, senti.getSentiment(uniqueComments, score="scale")))
+
+        commentSentiments = [scoreByComment[comment] for comment in allComments]
+        positiveComments = list()
+        negativeComments = list()
+        generallyNegative = 0
+
+        for comments in itemComments:
+            scores = [scoreByComment[comment] for comment in comments]
+            commentSentimentsPositive = sum(1 for value in scores if value >= 1)
+            commentSentimentsNegative = sum(1 for value in scores if value <= -1)
+
+            positiveComments.append(commentSentimentsPositive)
+            negativeComments.append(commentSentimentsNegative)
+
+            if len(comments) > 0 and commentSentimentsNegative / len(comments) > 0.5:
+                generallyNegative += 1
+
+        return commentSentiments, positiveComments, negativeComments, generallyNegative
+
+    # non empty comments, the ones longer than 20KB are split in chunks
+    @staticmethod
+    def splitComments(comments: List[str]) -> List[str]:
+        comments = list(
+            comment for comment in comments if comment and comment.strip()
+        )
+
+        splitComments = []
+        for comment in comments:
+
+            # calc number of chunks
+            byteChunks = math.ceil(sys.getsizeof(comment) / (20 * 1024))
+            if byteChunks > 1:
+
+                # calc desired max length of each chunk
+                chunkLength = math.floor(len(comment) / byteChunks)
+
+                # divide comment into chunks
+                chunks = [
+                    comment[i * chunkLength : i * chunkLength + chunkLength]
+                    for i in range(0, byteChunks)
+                ]
 
-            lock = threading.Lock()
-            with lock:
-                positiveComments.append(commentSentimentsPositive)
-                negativeComments.append(commentSentimentsNegative)
+                # save chunks
+                splitComments.extend(chunks)
 
-                if commentSentimentsNegative / len(comments) > 0.5:
-                    generallyNegative.append(True)
+            else:
+                # append comment as-is
+                splitComments.append(comment)
+
+        return splitComments
 
     @staticmethod
-    def getToxicityPercentage(config: Configuration, comments: List):
+    def getToxicityPercentage(config: Configuration, comments: List, cache: SentimentCache = None):
 
         if config.googleKey is None:
             return 0
         # comment out to pause toxicity analysis
         # return 0
 
+        # only the comments never scored before are sent to the Perspective API
+        toxicities = cache.lookup("toxicity", comments) if cache is not None else [None] * len(comments)
+        pending = [idx for idx, toxicity in enumerate(toxicities) if toxicity is None]
+
         # estimate completion
         qpsLimit = 1
         buffer = 5
         queryLimit = (qpsLimit * 60) - buffer
 
-        toxicityMinutes = math.ceil(len(comments) / queryLimit)
+        toxicityMinutes = math.ceil(len(pending) / queryLimit)
         print(
             f"    Toxicity per comment, expecting around {toxicityMinutes} minute(s) completion time",
             end="",
         )
 
-        # declare toxicity results store
-        toxicResults = 0
-
         # wait until the next minute
-        sleepUntilNextMinute()
+        if len(pending) > 0:
+            sleepUntilNextMinute()
 
         # run analysis
-        for idx, comment in enumerate(comments):
+        for idx, commentIdx in enumerate(pending):
+            comment = comments[commentIdx]
 
             # build request
             url = (
@@ -97,9 +132,10 @@ class SentimentAnalysis:
                 e = dict["error"]
                 raise Exception(f'Error {e["code"]} {e["status"]}: {e["message"]}')
 
-            # add to results store if toxic
-            if toxicity >= 0.5:
-                toxicResults += 1
+            toxicities[commentIdx] = toxicity
+
+            if cache is not None:
+                cache.store("toxicity", [comment], [toxicity])
 
             print(".", end="")
 
@@ -112,6 +148,9 @@ class SentimentAnalysis:
 
         print()
 
+        # count toxic comments
+        toxicResults = sum(1 for toxicity in toxicities if toxicity >= 0.5)
+
         # calculate percentage of toxic comments
         percentage = 0 if len(comments) == 0 else toxicResults / len(comments)
 
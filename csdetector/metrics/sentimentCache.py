@@ -0,0 +1,115 @@
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+from collections import Counter
+from typing import List
+
+# texts looked up per query, below the SQLite limit of bound parameters
+LOOKUP_BATCH = 500
+
+# persistent store of sentiment, toxicity and politeness scores shared by
+# every analysis and every run in the same output path
+# scores are keyed by kind and by the sha256 of the trimmed text, so repeated
+# texts (merge commits, bot comments, re-runs) are only scored once
+# the least recently used scores are evicted above maxEntries
+class SentimentCache:
+    def __init__(self, path: str, maxEntries: int) -> None:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        self._maxEntries = maxEntries
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.execute(
+            """CREATE TABLE IF NOT EXISTS scores (
+                kind TEXT,
+                key TEXT,
+                value TEXT,
+                used INTEGER,
+                PRIMARY KEY (kind, key)
+            )"""
+        )
+        self._connection.execute("CREATE INDEX IF NOT EXISTS scores_used ON scores (used)")
+        self._connection.commit()
+
+        # logical clock of the last use of every score, drives the eviction
+        clock, count = self._connection.execute("SELECT MAX(used), COUNT(*) FROM scores").fetchone()
+        self._clock = clock or 0
+        self._count = count
+
+        self.hits = Counter()
+        self.misses = Counter()
+
+    # cached score of every text, None for the ones never scored
+    def lookup(self, kind: str, texts: List[str]) -> list:
+        keys = [self.key(text) for text in texts]
+        values = {}
+
+        with self._lock:
+            uniqueKeys = list(set(keys))
+            self._clock += 1
+
+            for i in range(0, len(uniqueKeys), LOOKUP_BATCH):
+                batch = uniqueKeys[i : i + LOOKUP_BATCH]
+                placeholders = ",".join("?" * len(batch))
+
+                rows = self._connection.execute(
+                    "SELECT key, value FROM scores WHERE kind = ? AND key IN ({})".format(placeholders),
+                    [kind] + batch,
+                ).fetchall()
+                values.update((key, json.loads(value)) for key, value in rows)
+
+                self._connection.execute(
+                    "UPDATE scores SET used = ? WHERE kind = ? AND key IN ({})".format(placeholders),
+                    [self._clock, kind] + batch,
+                )
+
+            self._connection.commit()
+
+            results = [values.get(key) for key in keys]
+            hits = sum(1 for value in results if value is not None)
+            self.hits[kind] += hits
+            self.misses[kind] += len(results) - hits
+
+        return results
+
+    def store(self, kind: str, texts: List[str], values: list) -> None:
+        with self._lock:
+            self._clock += 1
+            rows = {self.key(text): json.dumps(value) for text, value in zip(texts, values)}
+
+            before = self._connection.total_changes
+            self._connection.executemany(
+                "INSERT OR IGNORE INTO scores VALUES (?, ?, ?, ?)",
+                [(kind, key, value, self._clock) for key, value in rows.items()],
+            )
+            self._count += self._connection.total_changes - before
+
+            if self._count > self._maxEntries:
+                self._connection.execute(
+                    "DELETE FROM scores WHERE rowid IN (SELECT rowid FROM scores ORDER BY used LIMIT ?)",
+                    (self._count - self._maxEntries,),
+                )
+                self._count = self._maxEntries
+
+            self._connection.commit()
+
+    def logStatistics(self) -> None:
+        for kind in sorted(set(self.hits) | set(self.misses)):
+            total = self.hits[kind] + self.misses[kind]
+            ratio = 0 if total == 0 else self.hits[kind] / total * 100
+            logging.info(
+                "Sentiment cache ({}): {} hits, {} misses ({:.1f}% hit rate)".format(
+                    kind, self.hits[kind], self.misses[kind], ratio
+                )
+            )
+
+    def close(self) -> None:
+        with self._lock:
+            self._connection.close()
+
+    @staticmethod
+    def key(text: str) -> str:
+        return hashlib.sha256(text.strip().encode("utf-8")).hexdigest()
@@ -0,0 +1,54 @@
+from abc import ABC, abstractmethod
+from typing import List
+
+from csdetector.metrics.sentimentCache import SentimentCache
+
+# common interface of the SentiStrength backends, getSentiment returns the same
+# results as sentistrength.PySentiStr.getSentiment and skips the cached texts
+# backends only implement the "positive negative neutral" scores of a text list
+# and name their cached scores with kind, as backends can score a text differently
+class SentimentScorer(ABC):
+    kind = "sentistrength"
+
+    def __init__(self, cache: SentimentCache = None) -> None:
+        self._cache = cache
+
+    def getSentiment(self, texts, score: str = "scale") -> list:
+        if isinstance(texts, str):
+            texts = [texts]
+
+        results = self._cachedScores(texts)
+
+        if score == "scale":
+            return [positive + negative for positive, negative, neutral in results]
+        elif score == "binary":
+            return [1 if positive >= abs(negative) else -1 for positive, negative, neutral in results]
+        elif score == "trinary":
+            return results
+        elif score == "dual":
+            return [(positive, negative) for positive, negative, neutral in results]
+
+        raise ValueError("Unknown sentiment score {}".format(score))
+
+    def close(self):
+        pass
+
+    @abstractmethod
+    def scores(self, texts: List[str]) -> List[tuple]:
+        pass
+
+    def _cachedScores(self, texts: List[str]) -> List[tuple]:
+        if self._cache is None:
+            return self.scores(texts)
+
+        results = self._cache.lookup(self.kind, texts)
+        pending = [i for i, result in enumerate(results) if result is None]
+        pendingTexts = [texts[i] for i in pending]
+
+        scores = self.scores(pendingTexts)
+        self._cache.store(self.kind, pendingTexts, scores)
+
+        for i, score in zip(pending, scores):
+            results[i] = score
+
+        return [tuple(result) for result in results]
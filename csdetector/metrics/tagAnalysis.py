@@ -4,13 +4,21 @@ import os
 import datetime
 from typing import List
 from dateutil.relativedelta import relativedelta
+import numpy as np
 
+from csdetector.entities.CommitTable import CommitTable, parseRawDate, toDatetime
 from csdetector.utils.statistics import outputStatistics
 
+# fields of every tag in the `git for-each-ref` output, the tagger date is only
+# set for annotated tags and the peeled commit date only when the tag points to
+# a tag object, lightweight tags use the commit date of the ref itself
+TAG_FORMAT = "%(refname)%00%(taggerdate:raw)%00%(*committerdate:raw)%00%(committerdate:raw)"
+
 class TagAnalysis:
-    def __init__(self, config, repo, delta: relativedelta, batchDates: List[datetime.datetime], daysActive: List[int]):
+    def __init__(self, config, repo, commits: CommitTable, delta: relativedelta, batchDates: List[datetime.datetime], daysActive: List[int]):
         self._config = config
         self._repo = repo
+        self._commits = commits
         self._delta = delta
         self._batchDates = batchDates
         self._daysActive = daysActive
@@ -18,30 +26,31 @@ class TagAnalysis:
 
     def extract(self):
         tagInfo = []
-        tags = sorted(self._repo.tags, key=self._getTaggedDate)
+        tags = sorted(self._readTags(), key=lambda tag: tag["rawData"])
         logging.info("Found {} tags".format(len(tags)))
 
-        if len(tags) > 0:
-            lastTag = None
-
-            for tag in tags:
-                commitCount = 0
-                if lastTag is None:
-                    commitCount = len(list(tag.commit.iter_items(self._repo, tag.commit)))
-                else:
-                    sinceStr = self._getTaggedDate(lastTag).strftime("%Y-%m-%d") 
-                    commitCount = len(list(tag.commit.iter_items(self._repo, tag.commit, after=sinceStr)))
-
-                tagInfo.append(
-                    dict(
-                        path=tag.path,
-                        rawData=self._getTaggedDate(tag),
-                        date=self._getTaggedDate(tag).strftime("%Y-%m-%d"),
-                        commitCount=commitCount,
-                    ) 
+        # commits are counted by date with a binary search over the sorted commit timestamps
+        committedTs = np.sort(self._commits.committedTs)
+        lastTag = None
+
+        for tag in tags:
+            last = int(np.searchsorted(committedTs, tag["commitTs"], side="right"))
+
+            if lastTag is None:
+                first = 0
+            else:
+                first = int(np.searchsorted(committedTs, lastTag["rawData"].timestamp(), side="right"))
+
+            tagInfo.append(
+                dict(
+                    path=tag["path"],
+                    rawData=tag["rawData"],
+                    date=tag["rawData"].strftime("%Y-%m-%d"),
+                    commitCount=max(0, last - first),
                 )
+            )
 
-                lastTag = tag
+            lastTag = tag
 
         for idx, batchStartDate in enumerate(self._batchDates):
             batchEndDate = batchStartDate + self._delta
@@ -86,19 +95,24 @@ class TagAnalysis:
             self._config.resultsPath,
         )
 
-    def _getTaggedDate(self, tag):
-        date = None
+    # path, tagged date and the commit date of every tag read in one git call
+    def _readTags(self):
+        tags = []
+        output = self._repo.git.for_each_ref("refs/tags", "--format=" + TAG_FORMAT)
+
+        for line in output.splitlines():
+            path, taggedDate, peeledCommitDate, commitDate = line.split("\x00")
 
-        if tag.tag == None:
-            date = tag.commit.committed_datetime
-        else:
+            # annotated tags are dated by the tagger, lightweight ones by their commit
+            commitDate = peeledCommitDate or commitDate
+            date = taggedDate or commitDate
 
-            # get timezone
-            offset = tag.tag.tagger_tz_offset
-            tzinfo = datetime.timezone(-datetime.timedelta(seconds=offset))
+            # tags of trees or blobs have no commit to count
+            if not commitDate:
+                continue
 
-            # get aware date from timestamp
-            date = tag.tag.tagged_date
-            date = datetime.datetime.fromtimestamp(date, tzinfo)
+            tagTs, tagTz = parseRawDate(date)
+            commitTs, _ = parseRawDate(commitDate)
+            tags.append(dict(path=path, rawData=toDatetime(tagTs, tagTz), commitTs=commitTs))
 
-        return date
+        return tags
@@ -1,10 +1,17 @@
 import git
+import hashlib
+import logging
 import shutil
 import os
+import socket
 import stat
+import time
 
 from csdetector import Configuration
 
+# seconds a run waits for the mirror lock of another run before giving up
+LOCK_TIMEOUT = 6 * 3600
+
 def remove_readonly(fn, path, excinfo):
     os.chmod(path, stat.S_IWRITE)
     remove_tree(path)
@@ -36,22 +43,209 @@ def getRepo(config: Configuration):
         config.repositoryPath,
         "{}.{}".format(config.repositoryOwner, config.repositoryName),
     )
+
+    if config.mirrorPath is not None:
+        return getMirroredRepo(config, repoPath)
+
     # get repository reference
     repo = None
     fullRepoPath = os.path.join(os.getcwd(), repoPath)
     if not os.path.exists(fullRepoPath):
         print("Downloading repository...")
-        repo = git.Repo.clone_from(
+        repo = cloneRepo(
             config.repositoryUrl,
             repoPath,
-            progress=Progress(),
-            odbt=git.GitCmdObjectDB,
+            cloneOptions(config),
+            bare=config.cloneMode == "metadata",
         )
         print()
     else:
         repo = git.Repo(repoPath, odbt=git.GitCmdObjectDB)
     return repo
 
+# one bare mirror per repository URL is shared by every output path, it is
+# cloned once, refreshed with an incremental fetch on every run and each run
+# reads a bare clone of it sharing its objects through git alternates
+def getMirroredRepo(config: Configuration, repoPath: str):
+    url = config.repositoryUrl.rstrip("/")
+    if url.endswith(".git"):
+        url = url[:-4]
+
+    mirrorPath = os.path.join(
+        config.mirrorPath,
+        "{}.{}-{}.git".format(
+            config.repositoryOwner,
+            config.repositoryName,
+            hashlib.sha1(url.lower().encode("utf-8")).hexdigest()[:12],
+        ),
+    )
+
+    os.makedirs(config.mirrorPath, exist_ok=True)
+
+    # a partial clone cannot be cloned locally and git ignores --shared for a
+    # shallow one, so the mirror always holds the full history
+    if len(cloneOptions(config)) > 0:
+        logging.warning("The clone mode and shallow clone options are ignored for mirrored repositories")
+
+    with FileLock(mirrorPath + ".lock"):
+        if os.path.exists(mirrorPath) and isPartialOrShallow(mirrorPath):
+            logging.info("Replacing the partial or shallow mirror {}".format(mirrorPath))
+            remove_tree(mirrorPath)
+
+        if not os.path.exists(mirrorPath):
+            print("Downloading repository mirror...")
+            mirror = cloneRepo(config.repositoryUrl, mirrorPath, [], bare=True)
+            print()
+
+            # branches and tags only, GitHub also serves a ref for every pull request
+            mirror.git.config("remote.origin.fetch", "+refs/heads/*:refs/heads/*")
+
+            # objects of the mirror are read by older per-run clones through their
+            # alternates, no gc triggered by a later fetch may prune them
+            mirror.git.config("gc.auto", "0")
+        else:
+            logging.info("Fetching mirror {}".format(mirrorPath))
+            mirror = git.Repo(mirrorPath, odbt=git.GitCmdObjectDB)
+            mirror.git.config("gc.auto", "0")
+            mirror.git.fetch("origin", "--prune", "--tags")
+
+        # the per-run clone only holds refs, it is cheaper to make it again than to update it
+        if os.path.exists(repoPath):
+            remove_tree(repoPath)
+
+        return git.Repo.clone_from(
+            mirrorPath,
+            repoPath,
+            odbt=git.GitCmdObjectDB,
+            bare=True,
+            shared=True,
+        )
+
+def isPartialOrShallow(path: str):
+    repo = git.Repo(path, odbt=git.GitCmdObjectDB)
+    with repo.config_reader() as config:
+        promisor = config.has_option('remote "origin"', "promisor")
+    return promisor or os.path.exists(os.path.join(repo.git_dir, "shallow"))
+
+# only commit and tag metadata is read from the clone, the metadata mode skips
+# every file content, the shallow mode also skips the history before the start date
+def cloneOptions(config: Configuration):
+    options = []
+
+    if config.cloneMode == "metadata":
+        options.append("--filter=blob:none")
+
+    if config.shallowClone and config.startDate is not None:
+        options.append("--shallow-since={}".format(config.startDate))
+
+    return options
+
+def cloneRepo(url: str, path: str, options: list, bare: bool = False):
+    if len(options) > 0:
+        try:
+            return git.Repo.clone_from(
+                url,
+                path,
+                progress=Progress(),
+                odbt=git.GitCmdObjectDB,
+                multi_options=options,
+                bare=bare,
+            )
+        except git.GitCommandError as e:
+            # servers without partial or shallow clone support refuse the options
+            logging.warning("Clone with {} failed, falling back to a full clone: {}".format(options, e))
+
+            if os.path.exists(path):
+                remove_tree(path)
+
+    return git.Repo.clone_from(
+        url,
+        path,
+        progress=Progress(),
+        odbt=git.GitCmdObjectDB,
+        bare=bare,
+    )
+
+# exclusive lock between processes, held by whoever creates the lock file first
+# the file holds the host and PID of its owner, a lock left by a crashed run on
+# this host is broken, other stale locks fail after the timeout
+class FileLock:
+    def __init__(self, path: str, interval: float = 1, timeout: float = LOCK_TIMEOUT) -> None:
+        self._path = path
+        self._interval = interval
+        self._timeout = timeout
+
+    def __enter__(self):
+        owner = "{} {}".format(socket.gethostname(), os.getpid())
+        deadline = time.time() + self._timeout
+        waiting = False
+
+        while True:
+            try:
+                fd = os.open(self._path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+            except FileExistsError:
+                if self._breakStale():
+                    continue
+
+                if time.time() >= deadline:
+                    raise TimeoutError(
+                        "{} is still locked by {} after {:g} seconds, remove it if no other run is using the mirror".format(
+                            self._path, self._owner(), self._timeout
+                        )
+                    )
+
+                if not waiting:
+                    logging.info("Waiting for {} held by {}".format(self._path, self._owner()))
+                    waiting = True
+                time.sleep(self._interval)
+                continue
+
+            with os.fdopen(fd, "w") as f:
+                f.write(owner)
+            return self
+
+    def __exit__(self, *args):
+        os.remove(self._path)
+
+    def _owner(self) -> str:
+        try:
+            with open(self._path) as f:
+                return f.read().strip()
+        except OSError:
+            return ""
+
+    def _breakStale(self) -> bool:
+        owner = self._owner()
+        host, _, pid = owner.rpartition(" ")
+
+        if host != socket.gethostname() or not pid.isdigit() or processAlive(int(pid)):
+            return False
+
+        # renaming first lets a single waiter break the lock
+        stalePath = "{}.{}.stale".format(self._path, os.getpid())
+        try:
+            os.rename(self._path, stalePath)
+        except OSError:
+            return True
+
+        os.remove(stalePath)
+        logging.warning("Removed the stale lock {} left by {}".format(self._path, owner))
+        return True
+
+
+def processAlive(pid: int) -> bool:
+    # signals cannot probe a process on Windows, the lock timeout applies there
+    if os.name == "nt":
+        return True
+
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+
+    return True
 
 
 class Progress(git.remote.RemoteProgress):
@@ -46,8 +46,9 @@ if __name__ == "__main__":
         "progress",
         "strsimpy",
         "python-dateutil",
-        "sentistrength",
         "joblib",
+        "numpy",
+        "scipy",
     }
 
     installed = {pkg for pkg in pkg_resources.working_set.by_key}